@@ -0,0 +1,645 @@
+"""sqlite3-only Storage backend, used when SQLAlchemy is not installed."""
+
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from urllib.request import pathname2url
+
+import sqlite3
+
+logger = logging.getLogger("vncrcc.storage")
+
+try:
+    import zstandard as zstd
+except Exception:  # pragma: no cover - optional dependency
+    zstd = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _json_loads = orjson.loads
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+
+# Column order of position history rows/arrays
+_HISTORY_FIELDS = ("timestamp", "latitude", "longitude", "altitude", "groundspeed", "heading")
+# Column order of the incidents SELECT in list_incidents
+_INC_KEYS = ("id", "detected_at", "callsign", "cid", "name", "lat", "lon", "altitude", "zone", "evidence")
+
+
+def _history_arrays(rows: List[tuple]) -> Dict[str, Any]:
+    """Turn (timestamp, lat, lon, alt, gs, hdg) rows into float64 columns."""
+    import numpy as np
+
+    cols = list(zip(*rows)) or [()] * len(_HISTORY_FIELDS)
+    return {k: np.asarray(c, dtype=np.float64) for k, c in zip(_HISTORY_FIELDS, cols)}
+
+
+# Frame magic number used to tell compressed snapshots from legacy JSON text
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+class Storage:
+    """Simple sqlite-backed storage for snapshots and incidents.
+
+    This fallback keeps the original sqlite3-based API used by tests and
+    small deployments. It mirrors the legacy behavior and surface area.
+    """
+
+    # Retention DELETEs scan whole tables; run them every N writes
+    # instead of inside every snapshot insert.
+    CLEANUP_EVERY = 50
+    # Position batches are kept for the same window as snapshots
+    POSITION_BATCHES_KEEP = 100
+    # Bumped whenever _init_db gains a migration; stored in PRAGMA user_version
+    SCHEMA_VERSION = 3
+    # Most queued writes the writer thread folds into one transaction
+    WRITE_BATCH_MAX = 256
+
+    def __init__(self, db_path: str = "vncrcc.db", readers: Optional[int] = None) -> None:
+        self.db_path = db_path
+        # A single writer connection serialized by `_writer_lock`; reads go
+        # through a pool of read-only connections so API requests don't
+        # queue behind the ingester under WAL.
+        self._writer = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Manage transactions explicitly (see _write_tx)
+        self._writer.isolation_level = None
+        self._writer_lock = threading.Lock()
+        # Compressor is only used under `_writer_lock`; it isn't thread-safe
+        self._zc = zstd.ZstdCompressor(level=3) if zstd else None
+        # Decoded latest snapshot, served without touching SQLite until the
+        # next save. `_version` is bumped on every save so a reader that
+        # raced a writer never caches a stale row.
+        self._cache_lock = threading.Lock()
+        self._latest_cache: Optional[Dict[str, Any]] = None
+        self._version = 0
+        self._snapshots_since_cleanup = 0
+        self._positions_since_cleanup = 0
+        try:
+            cur = self._writer.cursor()
+            # Let maintenance() reclaim free pages instead of VACUUM. Only
+            # takes effect on a fresh file, so it must precede the WAL
+            # switch which writes the header.
+            cur.execute("PRAGMA auto_vacuum=INCREMENTAL;")
+            cur.execute("PRAGMA journal_mode=WAL;")
+            cur.execute("PRAGMA synchronous=NORMAL;")
+            cur.execute("PRAGMA busy_timeout=5000;")
+            cur.execute("PRAGMA wal_autocheckpoint=1000;")
+        except Exception:
+            pass
+        with self._write_tx():
+            self._init_db()
+        self._readers: "queue.Queue[sqlite3.Connection]" = queue.Queue()
+        self._reader_count = 0
+        # An in-memory DB is private to its connection; readers would see
+        # an empty database, so reads share the writer instead.
+        if db_path != ":memory:":
+            for _ in range(readers or os.cpu_count() or 1):
+                try:
+                    self._readers.put(self._open_reader())
+                    self._reader_count += 1
+                except sqlite3.Error:
+                    break
+        # All writes are queued to one writer thread, which drains whatever
+        # is pending into a single BEGIN IMMEDIATE/COMMIT.
+        self._wq: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=10_000)
+        self._writer_thread = threading.Thread(target=self._writer_loop, name="vncrcc-storage-writer", daemon=True)
+        self._writer_thread.start()
+
+    def _open_reader(self) -> sqlite3.Connection:
+        uri = f"file:{pathname2url(os.path.abspath(self.db_path))}?mode=ro"
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute("PRAGMA busy_timeout=5000;")
+        return conn
+
+    @contextmanager
+    def _read_conn(self) -> Iterator[sqlite3.Connection]:
+        if not self._reader_count:
+            with self._writer_lock:
+                yield self._writer
+            return
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def _write_tx(self) -> Iterator[sqlite3.Cursor]:
+        """Run a write transaction on the writer connection.
+
+        BEGIN IMMEDIATE takes SQLite's write lock upfront instead of on the
+        first write statement, so a transaction never fails with
+        SQLITE_BUSY halfway through.
+        """
+        with self._writer_lock:
+            cur = self._writer.cursor()
+            cur.execute("BEGIN IMMEDIATE")
+            try:
+                yield cur
+            except BaseException:
+                self._writer.rollback()
+                raise
+            self._writer.commit()
+
+    def _submit(self, op: Callable[..., Any], *args: Any, after: Optional[Callable[[Any], None]] = None) -> Future:
+        """Queue `op(cur, *args)` for the writer thread.
+
+        `after(result)` runs on the writer thread once the transaction has
+        committed and before the returned future resolves.
+        """
+        fut: Future = Future()
+        self._wq.put((op, args, after, fut))
+        return fut
+
+    def _writer_loop(self) -> None:
+        while True:
+            batch = [self._wq.get()]
+            while batch[-1] is not None and len(batch) < self.WRITE_BATCH_MAX:
+                try:
+                    batch.append(self._wq.get_nowait())
+                except queue.Empty:
+                    break
+            stop = batch[-1] is None
+            if stop:
+                batch.pop()
+            if batch:
+                self._run_write_batch(batch)
+            if stop:
+                return
+
+    def _run_write_batch(self, batch: List[tuple]) -> None:
+        results: List[tuple] = []
+        try:
+            with self._write_tx() as cur:
+                for op, args, after, fut in batch:
+                    # A savepoint per op keeps one failing write from
+                    # rolling back the others in the batch.
+                    cur.execute("SAVEPOINT op")
+                    try:
+                        results.append((fut, after, op(cur, *args), None))
+                    except Exception as exc:
+                        cur.execute("ROLLBACK TO op")
+                        results.append((fut, None, None, exc))
+                    cur.execute("RELEASE op")
+        except Exception as exc:
+            for _, _, _, fut in batch:
+                fut.set_exception(exc)
+            return
+        for fut, after, result, exc in results:
+            if exc is not None:
+                fut.set_exception(exc)
+                continue
+            if after is not None:
+                try:
+                    after(result)
+                except Exception:
+                    logger.exception("Post-commit hook failed")
+            fut.set_result(result)
+
+    def maintenance(self) -> None:
+        """Truncate the WAL and release free pages.
+
+        Meant for an off-peak job (e.g. nightly); never call it from the
+        ingest path.
+        """
+        with self._writer_lock:
+            self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._writer.execute("PRAGMA incremental_vacuum")
+
+    def close(self) -> None:
+        self._wq.put(None)
+        self._writer_thread.join()
+        while self._reader_count:
+            self._readers.get().close()
+            self._reader_count -= 1
+        with self._writer_lock:
+            self._writer.close()
+
+    def _init_db(self) -> None:
+        cur = self._writer.cursor()
+        version = cur.execute("PRAGMA user_version").fetchone()[0]
+        cur.execute(
+            """
+        CREATE TABLE IF NOT EXISTS snapshots (
+            id INTEGER PRIMARY KEY,
+            fetched_at REAL,
+            raw_json BLOB
+        )
+        """
+        )
+        # Migration: snapshots used to store raw_json as TEXT. Rebuild the
+        # table with a BLOB column; existing rows are copied as-is and
+        # still decode since _decode_json accepts plain JSON.
+        if version < 2:
+            cols = {r[1]: r[2] for r in cur.execute("PRAGMA table_info(snapshots)")}
+            if cols.get("raw_json", "").upper() == "TEXT":
+                cur.execute("CREATE TABLE snapshots_v2 (id INTEGER PRIMARY KEY, fetched_at REAL, raw_json BLOB)")
+                cur.execute("INSERT INTO snapshots_v2 (id, fetched_at, raw_json) SELECT id, fetched_at, raw_json FROM snapshots")
+                cur.execute("DROP TABLE snapshots")
+                cur.execute("ALTER TABLE snapshots_v2 RENAME TO snapshots")
+        cur.execute(
+            """
+        CREATE TABLE IF NOT EXISTS incidents (
+            id INTEGER PRIMARY KEY,
+            detected_at REAL,
+            callsign TEXT,
+            cid INTEGER,
+            name TEXT,
+            lat REAL,
+            lon REAL,
+            altitude REAL,
+            zone TEXT,
+            evidence TEXT
+        )
+        """
+        )
+        # Migration: add name column to databases created before it existed
+        if version < 1:
+            try:
+                cur.execute("ALTER TABLE incidents ADD COLUMN name TEXT")
+            except sqlite3.OperationalError:
+                pass  # Column already exists
+        # One row per snapshot holding every pilot's position, packed as
+        # [[cid, callsign, lat, lon, alt, gs, hdg], ...]. Writing one row
+        # instead of one per pilot keeps ingest and WAL growth flat.
+        cur.execute(
+            """
+        CREATE TABLE IF NOT EXISTS positions_batch (
+            id INTEGER PRIMARY KEY,
+            snapshot_id INTEGER,
+            fetched_at REAL,
+            packed BLOB
+        )
+        """
+        )
+        # Migration: positions used to be stored one row per pilot in
+        # aircraft_positions. Fold its newest polls into batches (without a
+        # snapshot id) and drop it.
+        if version < 3:
+            self._migrate_aircraft_positions(cur)
+        # History reads walk batches newest-first; latest-snapshot and
+        # incident listings order by time.
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_posbatch_fetched ON positions_batch(fetched_at DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_snap_fetched ON snapshots(fetched_at DESC)")
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_inc_detected ON incidents(detected_at DESC)")
+        if version < self.SCHEMA_VERSION:
+            cur.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+
+    def _migrate_aircraft_positions(self, cur: sqlite3.Cursor) -> None:
+        # Runs inside _init_db's transaction
+        if not cur.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'aircraft_positions'").fetchone():
+            return
+        rows = cur.execute("""
+            SELECT timestamp, cid, callsign, latitude, longitude, altitude, groundspeed, heading
+            FROM aircraft_positions
+            WHERE timestamp IN (
+                SELECT DISTINCT timestamp FROM aircraft_positions ORDER BY timestamp DESC LIMIT ?
+            )
+            ORDER BY timestamp
+        """, (self.POSITION_BATCHES_KEEP,)).fetchall()
+        batches: Dict[float, List[tuple]] = {}
+        for ts, *row in rows:
+            batches.setdefault(ts, []).append(row)
+        cur.executemany(
+            "INSERT INTO positions_batch (snapshot_id, fetched_at, packed) VALUES (NULL, ?, ?)",
+            [(ts, self._encode_json(batch)) for ts, batch in batches.items()],
+        )
+        cur.execute("DROP TABLE aircraft_positions")
+
+    def save_snapshot(self, data: Dict[str, Any], fetched_at: Optional[float] = None,
+                      raw: Optional["bytes | bytearray"] = None) -> int:
+        return self.submit_snapshot(data, fetched_at, raw).result()
+
+    def submit_snapshot(self, data: Dict[str, Any], fetched_at: Optional[float] = None,
+                        raw: Optional["bytes | bytearray"] = None) -> Future:
+        """Queue a snapshot write; the future resolves to the snapshot id.
+
+        `raw`, the JSON body `data` was parsed from, is stored as-is when given.
+        """
+        if fetched_at is None:
+            fetched_at = time.time()
+        return self._submit(
+            self._save_snapshot_op, data, fetched_at, raw,
+            after=lambda sid: self._publish_latest(data, fetched_at),
+        )
+
+    def _save_snapshot_op(self, cur: sqlite3.Cursor, data: Dict[str, Any], fetched_at: float,
+                          raw: Optional["bytes | bytearray"] = None) -> int:
+        cur.execute("INSERT INTO snapshots (fetched_at, raw_json) VALUES (?, ?)", (fetched_at, self._encode_json(data, raw)))
+        sid = cur.lastrowid or 0
+        # Only track positions if enabled (expensive on sqlite)
+        if os.getenv("VNCRCC_TRACK_POSITIONS", "0").strip() == "1":
+            self._save_aircraft_positions(data, fetched_at, sid)
+        self._snapshots_since_cleanup += 1
+        if self._snapshots_since_cleanup >= self.CLEANUP_EVERY:
+            self._cleanup_old_snapshots()
+            self._snapshots_since_cleanup = 0
+        return sid
+
+    def _publish_latest(self, data: Dict[str, Any], fetched_at: float) -> None:
+        with self._cache_lock:
+            self._version += 1
+            cached = self._latest_cache
+            if cached is None or fetched_at >= cached["fetched_at"]:
+                self._latest_cache = {"data": data, "fetched_at": fetched_at}
+            else:
+                self._latest_cache = None
+
+    def get_latest_snapshot(self) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            cached = self._latest_cache
+            version = self._version
+        if cached is not None:
+            return cached
+        with self._read_conn() as conn:
+            row = conn.execute("SELECT raw_json, fetched_at FROM snapshots ORDER BY fetched_at DESC LIMIT 1").fetchone()
+        if not row:
+            return None
+        raw, ts = row
+        snap = {"data": self._decode_json(raw), "fetched_at": ts}
+        with self._cache_lock:
+            if self._version == version:
+                self._latest_cache = snap
+        return snap
+
+    def list_snapshots(self, limit: int = 10) -> List[Dict[str, Any]]:
+        with self._read_conn() as conn:
+            rows = conn.execute("SELECT raw_json, fetched_at FROM snapshots ORDER BY fetched_at DESC LIMIT ?", (limit,)).fetchall()
+        out: List[Dict[str, Any]] = []
+        for raw, ts in rows:
+            out.append({"data": self._decode_json(raw), "fetched_at": ts})
+        return out
+
+    def get_latest_snapshots(self, n: int = 2) -> List[Dict[str, Any]]:
+        return self.list_snapshots(limit=n)
+
+    def _encode_json(self, data: Any, raw: Optional["bytes | bytearray"] = None) -> Any:
+        # `raw` is the JSON text `data` was parsed from; reuse it if given
+        payload = raw if raw is not None else _json_dumps(data)
+        if self._zc is None:
+            # Without zstandard installed keep storing plain JSON text
+            return bytes(payload).decode()
+        return sqlite3.Binary(self._zc.compress(payload))
+
+    @staticmethod
+    def _decode_json(raw: Any) -> Any:
+        if isinstance(raw, (bytes, memoryview)):
+            raw = bytes(raw)
+            if raw[:4] == _ZSTD_MAGIC:
+                if zstd is None:
+                    raise RuntimeError("payload is zstd-compressed but zstandard is not installed")
+                # Decompressors aren't thread-safe and reads run on the pool
+                raw = zstd.ZstdDecompressor().decompress(raw)
+        return _json_loads(raw)
+
+    def _cleanup_old_snapshots(self, keep_recent: int = 100) -> None:
+        # Runs inside the caller's _write_tx
+        cur = self._writer.cursor()
+        cur.execute("""
+            DELETE FROM snapshots 
+            WHERE id NOT IN (
+                SELECT id FROM snapshots 
+                ORDER BY fetched_at DESC 
+                LIMIT ?
+            )
+        """, (keep_recent,))
+
+    @staticmethod
+    def _iter_position_rows(aircraft: List[Dict[str, Any]]) -> Iterator[tuple]:
+        for ac in aircraft:
+            get = ac.get
+            cid = get("cid")
+            lat = get("latitude") or get("lat")
+            lon = get("longitude") or get("lon")
+            if cid is None or lat is None or lon is None:
+                continue
+            yield (cid, get("callsign"), lat, lon, get("altitude"), get("groundspeed"), get("heading"))
+
+    def _save_aircraft_positions(self, data: Dict[str, Any], timestamp: float, snapshot_id: int) -> None:
+        # Runs inside the caller's _write_tx
+        aircraft = data.get("pilots") or data.get("aircraft") or []
+        self._writer.execute(
+            "INSERT INTO positions_batch (snapshot_id, fetched_at, packed) VALUES (?, ?, ?)",
+            (snapshot_id, timestamp, self._encode_json(list(self._iter_position_rows(aircraft)))),
+        )
+        self._positions_since_cleanup += 1
+        if self._positions_since_cleanup >= self.CLEANUP_EVERY:
+            self._cleanup_old_positions()
+            self._positions_since_cleanup = 0
+
+    def _cleanup_old_positions(self) -> None:
+        # Runs inside the caller's _write_tx
+        cur = self._writer.cursor()
+        try:
+            cur.execute("""
+                DELETE FROM positions_batch
+                WHERE fetched_at < (
+                    SELECT fetched_at FROM positions_batch
+                    ORDER BY fetched_at DESC LIMIT 1 OFFSET ?
+                )
+            """, (self.POSITION_BATCHES_KEEP - 1,))
+        except sqlite3.Error:
+            logger.warning("Position cleanup failed; retrying on the next pass", exc_info=True)
+
+    @staticmethod
+    def _norm_cid(cid: Any) -> Any:
+        # Packed rows carry cids as VATSIM sends them (ints); callers
+        # sometimes pass them as strings.
+        try:
+            return int(cid)
+        except (TypeError, ValueError):
+            return cid
+
+    def _collect_positions(self, cids: List[Any], per_cid: int, since: Optional[float] = None) -> Dict[Any, List[tuple]]:
+        """Walk position batches and gather up to `per_cid` hits per cid.
+
+        Each batch holds at most one position per cid, so without `since`
+        the window is the `per_cid` newest batches (like the SQLAlchemy
+        backend, which keeps the last polls); with `since` it is every batch
+        from then on. Batches are decoded newest-first (oldest-first from
+        `since`) and the walk stops early once every requested cid has
+        enough positions. Returns {cid: [(fetched_at, packed_row), ...]}.
+        """
+        wanted = {self._norm_cid(c) for c in cids if c is not None}
+        found: Dict[Any, List[tuple]] = {}
+        if not wanted or per_cid <= 0:
+            return found
+        with self._read_conn() as conn:
+            if since is None:
+                cur = conn.execute("SELECT fetched_at, packed FROM positions_batch ORDER BY fetched_at DESC LIMIT ?", (per_cid,))
+            else:
+                cur = conn.execute("SELECT fetched_at, packed FROM positions_batch WHERE fetched_at >= ? ORDER BY fetched_at ASC", (since,))
+            for ts, packed in cur:
+                for row in self._decode_json(packed):
+                    cid = row[0]
+                    if cid in wanted:
+                        hits = found.setdefault(cid, [])
+                        hits.append((ts, row))
+                        if len(hits) >= per_cid:
+                            wanted.discard(cid)
+                if not wanted:
+                    break
+        return found
+
+    def get_aircraft_positions(self, cid: str, since: Optional[float] = None, limit: int = 10) -> List[Dict[str, Any]]:
+        """Get position history for a specific aircraft CID.
+
+        Args:
+            cid: Aircraft CID
+            since: Optional timestamp to get positions after
+            limit: Maximum number of positions to return (default 10)
+
+        Returns:
+            List of position dicts with keys: ts, lat, lon, alt, gs, heading, callsign
+        """
+        hits = self._collect_positions([cid], limit, since).get(self._norm_cid(cid), [])
+        positions = []
+        for ts, row in hits:
+            positions.append({
+                "ts": ts,
+                "lat": row[2],
+                "lon": row[3],
+                "alt": row[4],
+                "gs": row[5],
+                "heading": row[6],
+                "callsign": row[1]
+            })
+        return positions
+
+    def save_incident(self, detected_at: float, callsign: str, cid: Optional[int], lat: float, lon: float, altitude: Optional[float], zone: str, evidence: str, name: Optional[str] = None) -> int:
+        return self.submit_incident(detected_at, callsign, cid, lat, lon, altitude, zone, evidence, name).result()
+
+    def submit_incident(self, detected_at: float, callsign: str, cid: Optional[int], lat: float, lon: float, altitude: Optional[float], zone: str, evidence: str, name: Optional[str] = None) -> Future:
+        """Queue an incident insert; the future resolves to the incident id."""
+        return self._submit(self._save_incident_op, (detected_at, callsign, cid, name, lat, lon, altitude, zone, evidence))
+
+    @staticmethod
+    def _save_incident_op(cur: sqlite3.Cursor, row: tuple) -> int:
+        cur.execute(
+            "INSERT INTO incidents (detected_at, callsign, cid, name, lat, lon, altitude, zone, evidence) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            row,
+        )
+        return cur.lastrowid or 0
+
+    def update_incident(self, id: int, evidence: str) -> None:
+        self._submit(self._update_incident_op, id, evidence).result()
+
+    @staticmethod
+    def _update_incident_op(cur: sqlite3.Cursor, id: int, evidence: str) -> None:
+        cur.execute("UPDATE incidents SET evidence = ? WHERE id = ?", (evidence, id))
+
+    def delete_incidents(self, ids: List[int]) -> int:
+        """Delete incidents by id; returns how many rows were removed."""
+        ids = list(ids)
+        if not ids:
+            return 0
+        return self._submit(self._delete_incidents_op, ids).result()
+
+    @staticmethod
+    def _delete_incidents_op(cur: sqlite3.Cursor, ids: List[int]) -> int:
+        cur.execute(f"DELETE FROM incidents WHERE id IN ({','.join('?' * len(ids))})", ids)
+        return cur.rowcount
+
+    def get_aircraft_position_history(self, cid: int, limit: int = 10) -> List[Dict[str, Any]]:
+        return self.get_positions_for_cids([cid], limit).get(self._norm_cid(cid), [])
+
+    def get_aircraft_position_history_arrays(self, cid: int, limit: int = 10) -> Dict[str, Any]:
+        """Column-oriented variant of get_aircraft_position_history().
+
+        Returns {"timestamp": ndarray, "latitude": ndarray, ...} (float64,
+        newest first, NaN for missing values) for vectorized consumers.
+        """
+        hits = self._collect_positions([cid], limit).get(self._norm_cid(cid), [])
+        return _history_arrays([(ts, row[2], row[3], row[4], row[5], row[6]) for ts, row in hits])
+
+    def get_positions_for_cids(self, cids: List[int], per_cid: int = 10) -> Dict[int, List[Dict[str, Any]]]:
+        """Return the latest `per_cid` positions for each cid in one pass.
+
+        Use this instead of calling get_aircraft_position_history() per
+        aircraft; cids with no stored positions are absent from the result.
+        """
+        out: Dict[int, List[Dict[str, Any]]] = {}
+        keys = _HISTORY_FIELDS
+        for cid, hits in self._collect_positions(cids, per_cid).items():
+            out[cid] = [dict(zip(keys, (ts, *row[2:7]))) for ts, row in hits]
+        return out
+
+    def list_incidents(self, limit: int = 100) -> List[Dict[str, Any]]:
+        with self._read_conn() as conn:
+            rows = conn.execute("SELECT id, detected_at, callsign, cid, name, lat, lon, altitude, zone, evidence FROM incidents ORDER BY detected_at DESC LIMIT ?", (limit,)).fetchall()
+        keys = _INC_KEYS
+        return [dict(zip(keys, r)) for r in rows]
+
+    def list_aircraft(self) -> List[Dict[str, Any]]:
+        """Return the latest snapshot's VATSIM pilot records, as the SQLAlchemy
+        backend does, but without its `position_history` lists.
+
+        Per-request N+1 history queries are very expensive on sqlite and not
+        needed for the main UI. The dedicated endpoint `/api/v1/aircraft/list/history`
+        serves history when required.
+        """
+        with self._cache_lock:
+            cached = self._latest_cache
+        if cached is None:
+            # Plain-text snapshots (written without zstd) let sqlite pull out
+            # just the pilots array instead of decoding the whole payload.
+            try:
+                with self._read_conn() as conn:
+                    row = conn.execute(
+                        "SELECT json_extract(raw_json, '$.pilots'), json_extract(raw_json, '$.aircraft') "
+                        "FROM snapshots WHERE typeof(raw_json) = 'text' "
+                        "AND fetched_at = (SELECT MAX(fetched_at) FROM snapshots)"
+                    ).fetchone()
+            except sqlite3.Error:
+                row = None
+            if row is not None:
+                for col in row:
+                    aircraft = _json_loads(col) if col else None
+                    if aircraft:
+                        return aircraft
+                return []
+        snap = cached or self.get_latest_snapshot()
+        if not snap:
+            return []
+        data = snap.get("data")
+        if not data:
+            return []
+        aircraft = data.get("pilots") or data.get("aircraft") or []
+        return aircraft
+
+    def save_classification(self, snapshot_id: int, typ: str, summary: Any) -> None:
+        # Not supported in fallback sqlite-only storage for now; noop
+        return None
+
+    def get_latest_classification(self, typ: str) -> Optional[Any]:
+        return None
+
+
+@functools.cache
+def get_storage() -> Optional[Storage]:
+    """Return the shared default Storage, opening it on first use."""
+    try:
+        return Storage()
+    except Exception:
+        logger.exception("Failed to open default storage")
+        return None
+
+
+__all__ = ["Storage", "get_storage"]
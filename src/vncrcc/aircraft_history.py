@@ -117,13 +117,15 @@ def update_history_batch(updates: Dict[str, Dict[str, Any]], filtered_cids: set
         if cids_to_remove:
             print(f"Removed {len(cids_to_remove)} aircraft from history (out of range)")
 
+    # One poll's worth of updates shares a single default timestamp
+    now = time.time()
     for cid, position in updates.items():
         if cid not in history:
             history[cid] = []
 
         # Add new position
         pos_copy = dict(position)
-        pos_copy.setdefault("ts", time.time())
+        pos_copy.setdefault("ts", now)
         history[cid].append(pos_copy)
 
         # Keep only last 10
@@ -3,10 +3,12 @@ from typing import List, Dict, Any
 
 from ... import storage
 from ...rate_limit import limiter
-from ...geo.loader import find_geo_by_keyword, point_from_aircraft
+from ...geo.loader import aircraft_columns, find_geo_by_keyword, match_shapes_xy
 from ...precompute import get_cached
 import math
 
+import numpy as np
+
 # DCA bullseye (lat, lon)
 DCA_BULL = (38.8514403, -77.0377214)
 
@@ -61,52 +63,17 @@ async def frz_aircraft(request: Request, name: str = Query("frz", description="k
         return {"aircraft": []}
     aircraft = snap.get("data", {}).get("pilots") or snap.get("data", {}).get("aircraft") or []
 
+    cols = aircraft_columns(aircraft)
+    lat, lon = cols["lat"], cols["lon"]
+    # FRZ applies up to 17,999 ft; skip unknown position/altitude or above 17,999
+    idx = np.flatnonzero(~np.isnan(lat) & (cols["alt"] <= 17999))
+    # points on the polygon boundary count as inside as well
+    matched = match_shapes_xy(shapes, lon[idx], lat[idx], line_tolerance=0.001)
+
     inside: List[Dict[str, Any]] = []
-    for a in aircraft:
-        pt = point_from_aircraft(a)
-        if not pt:
-            continue
-        # altitude: if present, treat similar to SFRA — only include aircraft at or below 18,000 ft
-        alt = a.get("altitude") or a.get("alt")
-        try:
-            alt_val = float(alt) if alt is not None else None
-        except Exception:
-            alt_val = None
-        # FRZ applies up to 17,999 ft; skip unknown altitude or above 17,999
-        if alt_val is None or alt_val > 17999:
-            continue
-
-        for shp, props in shapes:
-            matched = False
-            gtype = getattr(shp, "geom_type", "")
-            # Polygons: use contains/touches as before
-            if gtype in ("Polygon", "MultiPolygon"):
-                if shp.contains(pt) or shp.touches(pt):
-                    matched = True
-            # Lines: FRZ geo may be a LineString/MultiLineString; consider points within a small distance
-            elif gtype in ("LineString", "MultiLineString"):
-                # tolerance in degrees; allow overriding via geojson properties (e.g. "tolerance": 0.001)
-                tol = 0.001
-                try:
-                    if props and "tolerance" in props:
-                        tol = float(props.get("tolerance", tol))
-                except Exception:
-                    tol = 0.001
-                try:
-                    if pt.distance(shp) <= tol:
-                        matched = True
-                except Exception:
-                    matched = False
-            else:
-                # fallback: use intersects (covers Points etc.)
-                try:
-                    if shp.contains(pt) or shp.touches(pt) or shp.intersects(pt):
-                        matched = True
-                except Exception:
-                    matched = False
-
-            if matched:
-                dca = _dca_radial_range(pt.y, pt.x)
-                inside.append({"aircraft": a, "matched_props": props, "dca": dca})
-                break
+    for j in np.flatnonzero(matched >= 0):
+        i = idx[j]
+        # return the original aircraft dict plus matched geo properties and DCA radial/range
+        dca = _dca_radial_range(float(lat[i]), float(lon[i]))
+        inside.append({"aircraft": aircraft[i], "matched_props": shapes[matched[j]][1], "dca": dca})
     return {"aircraft": inside}
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Request
 from typing import Any, Dict
 import time
+from ... import storage
 from ...rate_limit import limiter
 from ...metrics import METRICS
 
@@ -53,7 +54,6 @@ async def get_vatsim_health(request: Request) -> Dict[str, Any]:
     - fetcher_status: Whether the fetch loop appears to be running
     """
     from ...app import FETCHER
-    from ...storage import STORAGE
 
     now = time.time()
     health = {
@@ -66,11 +66,12 @@ async def get_vatsim_health(request: Request) -> Dict[str, Any]:
     }
 
     if FETCHER:
-        health["last_fetch_ts"] = FETCHER.latest_ts
-        health["vatsim_data_age"] = FETCHER.latest_delay
+        _, last_fetch_ts, data_age = FETCHER.snapshot()
+        health["last_fetch_ts"] = last_fetch_ts
+        health["vatsim_data_age"] = data_age
 
-        if FETCHER.latest_ts:
-            time_since_fetch = now - FETCHER.latest_ts
+        if last_fetch_ts:
+            time_since_fetch = now - last_fetch_ts
             health["time_since_last_fetch"] = round(time_since_fetch, 1)
 
             # Determine fetcher health status
@@ -83,8 +84,8 @@ async def get_vatsim_health(request: Request) -> Dict[str, Any]:
                 health["fetcher_status"] = "healthy"
 
     # Check storage for additional context
-    if STORAGE:
-        latest_snap = STORAGE.get_latest_snapshot()
+    if storage.STORAGE:
+        latest_snap = storage.STORAGE.get_latest_snapshot()
         if latest_snap:
             snap_ts = latest_snap.get("fetched_at")
             if snap_ts:
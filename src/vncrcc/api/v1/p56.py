@@ -39,6 +39,7 @@ def _load_dotenv_if_present(max_levels: int = 6):
 # Attempt to load a .env file (if present in the repo root or higher)
 _load_dotenv_if_present()
 from shapely.geometry import LineString
+from shapely.strtree import STRtree
 import json
 import time
 
@@ -95,9 +96,6 @@ def _compute_p56_breaches(name: str) -> Dict[str, Any]:
         ident = _identifier(a)
         if not ident:
             continue
-        pt = point_from_aircraft(a)
-        if not pt:
-            continue
         # only consider previous positions within the vertical limit (<= 17,999 ft)
         alt_prev = a.get("altitude") or a.get("alt")
         try:
@@ -106,18 +104,29 @@ def _compute_p56_breaches(name: str) -> Dict[str, Any]:
             alt_prev_val = None
         if alt_prev_val is None or alt_prev_val > 17999:
             continue
+        pt = point_from_aircraft(a)
+        if not pt:
+            continue
         prev_map[ident] = {"pos": (pt.x, pt.y), "raw": a}
 
     breaches: List[Dict[str, Any]] = []
     # shapes is a list of (shape, properties) tuples; check all features
     features = shapes
+    # Bounding-box index so exact predicates only run for nearby zones
+    tree = STRtree([shp for shp, _ in features])
+    zone_names = [props.get("name") or props.get("id") or f"{name}:{idx}" for idx, (_, props) in enumerate(features)]
+
+    def _zones_hit(geom) -> List[int]:
+        # contains-or-intersects reduces to intersects; keep the features' order
+        try:
+            return sorted(tree.query(geom, predicate="intersects").tolist())
+        except Exception:
+            return []
+
     for a in latest_ac:
         ident = _identifier(a)
         if not ident:
             continue
-        latest_pt = point_from_aircraft(a)
-        if not latest_pt:
-            continue
         # only consider latest positions within the vertical limit (<= 17,999 ft)
         alt_latest = a.get("altitude") or a.get("alt")
         try:
@@ -126,6 +135,9 @@ def _compute_p56_breaches(name: str) -> Dict[str, Any]:
             alt_latest_val = None
         if alt_latest_val is None or alt_latest_val > 17999:
             continue
+        latest_pt = point_from_aircraft(a)
+        if not latest_pt:
+            continue
 
         # Check line intersection if we have a previous position for this ident
         matched_zones = []
@@ -133,13 +145,7 @@ def _compute_p56_breaches(name: str) -> Dict[str, Any]:
         if ident in prev_map:
             prev_pos = prev_map[ident]["pos"]
             line = LineString([(prev_pos[0], prev_pos[1]), (latest_pt.x, latest_pt.y)])
-            for idx, (shp, props) in enumerate(features):
-                zone_name = props.get("name") or props.get("id") or f"{name}:{idx}"
-                try:
-                    if shp.intersects(line):
-                        matched_zones.append(zone_name)
-                except Exception:
-                    continue
+            matched_zones = [zone_names[k] for k in _zones_hit(line)]
 
         if not matched_zones:
             # No line intersection detected. However, the aircraft may have
@@ -147,29 +153,14 @@ def _compute_p56_breaches(name: str) -> Dict[str, Any]:
             # by testing the latest point directly against the zones. If the
             # previous snapshot shows the aircraft was already inside, skip
             # (it's not a new penetration).
-            latest_inside_zones = []
-            for idx, (shp, props) in enumerate(features):
-                zone_name = props.get("name") or props.get("id") or f"{name}:{idx}"
-                try:
-                    if getattr(shp, "contains", lambda x: False)(latest_pt) or getattr(shp, "intersects", lambda x: False)(latest_pt):
-                        latest_inside_zones.append(zone_name)
-                except Exception:
-                    continue
+            latest_inside_zones = [zone_names[k] for k in _zones_hit(latest_pt)]
             if latest_inside_zones:
                 # Check whether previous position was also inside (if we have it)
                 prev_inside = False
                 if ident in prev_map:
                     try:
                         px, py = prev_map[ident]["pos"]
-                        from shapely.geometry import Point as ShPoint
-                        pprev = ShPoint(px, py)
-                        for shp, props in features:
-                            try:
-                                if getattr(shp, "contains", lambda x: False)(pprev) or getattr(shp, "intersects", lambda x: False)(pprev):
-                                    prev_inside = True
-                                    break
-                            except Exception:
-                                continue
+                        prev_inside = bool(_zones_hit(Point(px, py)))
                     except Exception:
                         prev_inside = False
                 if prev_inside:
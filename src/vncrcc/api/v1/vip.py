@@ -1,6 +1,6 @@
 """VIP activity API endpoint."""
 from fastapi import APIRouter, Request
-from ...storage import STORAGE
+from ... import storage
 from ...vip_activity import detect_vip_aircraft
 from ...rate_limit import limiter
 
@@ -25,7 +25,7 @@ async def get_vip_activity(request: Request) -> dict:
         return cached
     
     # Fallback to live computation if cache not available (e.g., on startup)
-    snapshot = STORAGE.get_latest_snapshot()
+    snapshot = storage.STORAGE.get_latest_snapshot()
     if not snapshot:
         return {"aircraft": [], "count": 0, "fetched_at": None}
     
@@ -3,9 +3,11 @@ from typing import List, Dict, Any, Optional
 
 from ... import storage
 from ...rate_limit import limiter
-from ...geo.loader import point_from_aircraft
+from ...geo.loader import aircraft_columns, dca_range_nm
 from .sfra import _dca_radial_range
 
+import numpy as np
+
 router = APIRouter(prefix="/vso")
 
 
@@ -42,15 +44,14 @@ async def vso_aircraft(request: Request, range_nm: int = Query(60, description="
     if affiliations:
         patterns = [p.strip() for p in affiliations.split(",") if p.strip()]
 
+    # include only within requested range (radius); unknown positions drop out as NaN
+    cols = aircraft_columns(aircraft)
+    lat, lon = cols["lat"], cols["lon"]
+    in_range = np.round(dca_range_nm(lat, lon), 1) <= int(range_nm)
+
     out: List[Dict[str, Any]] = []
-    for a in aircraft:
-        pt = point_from_aircraft(a)
-        if not pt:
-            continue
-        dca = _dca_radial_range(pt.y, pt.x)
-        # include only within requested range (radius)
-        if dca.get("range_nm", 999999) > int(range_nm):
-            continue
+    for i in np.flatnonzero(in_range):
+        a = aircraft[i]
 
         # extract remarks from nested flight_plan if present
         fp = a.get("flight_plan") or {}
@@ -60,6 +61,13 @@ async def vso_aircraft(request: Request, range_nm: int = Query(60, description="
         if patterns and not matched:
             continue
 
-        out.append({"aircraft": a, "dca": dca, "matched_affiliations": matched, "position_history": storage.STORAGE.get_aircraft_position_history(a.get("cid"), 10) if storage.STORAGE else []})
+        dca = _dca_radial_range(float(lat[i]), float(lon[i]))
+        out.append({"aircraft": a, "dca": dca, "matched_affiliations": matched})
+
+    # One batched history lookup instead of a query per aircraft
+    cids = [e["aircraft"].get("cid") for e in out if e["aircraft"].get("cid") is not None]
+    history = storage.STORAGE.get_positions_for_cids(cids, 10) if storage.STORAGE and cids else {}
+    for e in out:
+        e["position_history"] = history.get(e["aircraft"].get("cid"), [])
 
     return {"aircraft": out}
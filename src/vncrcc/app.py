@@ -12,7 +12,7 @@ from fastapi.staticfiles import StaticFiles
 from slowapi import _rate_limit_exceeded_handler
 from slowapi.errors import RateLimitExceeded
 
-from .storage import STORAGE
+from . import storage
 from .aircraft_history import update_history_batch
 from .vatsim_client import VatsimClient
 from .api import router as api_router
@@ -21,12 +21,18 @@ from .rate_limit import limiter
 from .metrics import METRICS
 import asyncio
 
+try:
+    # libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 def _load_config(path: str) -> Any:
     if not os.path.exists(path):
         return {}
     with open(path, "r") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=_YamlLoader) or {}
 
 
 CONFIG_PATH = os.environ.get("VNCRCC_CONFIG", "config/example_config.yaml")
@@ -79,8 +85,7 @@ class SmartCacheMiddleware(BaseHTTPMiddleware):
             
             # Add ETag based on latest snapshot timestamp for 304 support
             try:
-                from .storage import STORAGE
-                snap = STORAGE.get_latest_snapshot() if STORAGE else None
+                snap = storage.STORAGE.get_latest_snapshot() if storage.STORAGE else None
                 if snap:
                     ts = snap.get("fetched_at", 0)
                     etag = f'W/"{int(ts)}"'
@@ -134,12 +139,15 @@ FETCHER = VatsimClient(CFG.get("vatsim_url", "https://data.vatsim.net/v3/vatsim-
 _WRITE_JSON_HISTORY = os.getenv("VNCRCC_WRITE_JSON_HISTORY", "0").strip() == "1"
 _TRACK_POSITIONS = os.getenv("VNCRCC_TRACK_POSITIONS", "0").strip() == "1"
 
+# Event loop the app runs on; fetch callbacks execute on a worker thread and
+# use it to schedule their async follow-up work.
+_LOOP: "asyncio.AbstractEventLoop | None" = None
 
-def _on_fetch(data: dict, ts: float) -> None:
+
+def _on_fetch(data: dict, pilots: list, ts: float, raw: bytes) -> None:
     try:
-        sid = STORAGE.save_snapshot(data, ts)
-        aircraft = (data.get("pilots") or data.get("aircraft") or [])
-        count = len(aircraft)
+        sid = storage.STORAGE.save_snapshot(data, ts, raw=raw)
+        count = len(pilots)
         timestamp_str = datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S")
         logger.info("Saved snapshot %s with %d aircraft at %s", sid, count, timestamp_str)
 
@@ -150,7 +158,7 @@ def _on_fetch(data: dict, ts: float) -> None:
             # PERF FIX: Run precompute FIRST to cache aircraft_list, then history update
             # This breaks the circular dependency (precompute needs old history, updates need new aircraft_list)
             try:
-                await loop.run_in_executor(None, precompute_all, data, ts)
+                await loop.run_in_executor(None, precompute_all, data, ts, pilots)
             except Exception:
                 logger.exception("Background tasks failed")
 
@@ -196,12 +204,12 @@ def _on_fetch(data: dict, ts: float) -> None:
             except Exception:
                 logger.exception("Controller fetch failed")
 
-        try:
-            asyncio.get_running_loop().create_task(_bg())
-        except Exception:
-            # if not in an event loop (unlikely), run synchronously as last resort
+        if _LOOP is not None:
+            asyncio.run_coroutine_threadsafe(_bg(), _LOOP)
+        else:
+            # if no event loop is available (unlikely), run synchronously as last resort
             try:
-                precompute_all(data, ts)
+                precompute_all(data, ts, pilots)
             except Exception:
                 logger.exception("Precompute failed (sync fallback)")
     except Exception:
@@ -216,6 +224,8 @@ async def startup() -> None:
     # configure basic logging for development
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s [%(name)s] %(message)s")
     logger.info("VNCRCC_WRITE_JSON_HISTORY=%s VNCRCC_TRACK_POSITIONS=%s", _WRITE_JSON_HISTORY, _TRACK_POSITIONS)
+    global _LOOP
+    _LOOP = asyncio.get_running_loop()
     FETCHER.register_callback(_on_fetch)
     await FETCHER.start()
 
@@ -261,7 +271,7 @@ async def last_snapshot(request: Request) -> dict:
     This is a small debug endpoint useful to verify the fetch loop is saving
     snapshots at the expected interval.
     """
-    snap = STORAGE.get_latest_snapshot() if STORAGE else None
+    snap = storage.STORAGE.get_latest_snapshot() if storage.STORAGE else None
     if not snap:
         return {"last_snapshot": None}
     data = snap.get("data", {})
@@ -295,3 +305,11 @@ except Exception:
 
 
 __all__ = ["app", "STORAGE", "FETCHER"]
+
+
+def __getattr__(name: str) -> Any:
+    # Re-export the storage singleton lazily so importing the app does not
+    # open the database.
+    if name == "STORAGE":
+        return storage.STORAGE
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
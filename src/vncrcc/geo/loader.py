@@ -1,7 +1,12 @@
+import hashlib
 import json
+import math
+import os
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+import shapely
 from shapely.geometry import shape, Point, mapping, base
 import logging
 
@@ -10,9 +15,93 @@ logger = logging.getLogger("vncrcc.geo.loader")
 GEO_DIR = Path(__file__).parent
 _GEO_CACHE: Optional[Dict[str, List[Tuple[base.BaseGeometry, Dict]]]] = None
 
+# DCA bullseye (lat, lon) for range calculations
+DCA_BULL = (38.8514403, -77.0377214)
+
+# Parsed shapes are also cached on disk as WKB (hex, in a JSON file next to
+# the properties) so separate processes (the server, tools, test scripts)
+# skip GeoJSON parsing and repair on warm starts. The directory defaults to
+# $XDG_CACHE_HOME/vncrcc/geo and can be moved with VNCRCC_GEO_CACHE_DIR; set
+# VNCRCC_GEO_CACHE=0 to disable.
+# Bump when _parse_geojson's output changes so older cache entries are ignored.
+_CACHE_VERSION = 2
+
+
+def _disk_cache_dir() -> Path:
+    configured = os.environ.get("VNCRCC_GEO_CACHE_DIR")
+    if configured:
+        return Path(configured)
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "vncrcc" / "geo"
+
+
+def _disk_cache_prefix(path: Path) -> str:
+    # source name plus a short hash of its location, so same-named files in
+    # other checkouts get their own entries
+    digest = hashlib.sha1(str(path.resolve()).encode()).hexdigest()[:10]
+    return f"{path.stem}-{digest}"
+
+
+def _disk_cache_path(path: Path) -> Optional[Path]:
+    if os.getenv("VNCRCC_GEO_CACHE", "1").strip() == "0":
+        return None
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    # keyed by source, cache version, mtime and size so edited files are re-parsed
+    return _disk_cache_dir() / f"{_disk_cache_prefix(path)}-v{_CACHE_VERSION}-{st.st_mtime_ns}-{st.st_size}.wkb.json"
+
+
+def _read_disk_cache(cache: Path) -> Optional[List[Tuple[base.BaseGeometry, Dict]]]:
+    try:
+        entries = json.loads(cache.read_bytes())
+        shapes = shapely.from_wkb(entries["wkb"])
+        return list(zip(shapes.tolist(), entries["props"]))
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.warning("Ignoring unreadable geo cache %s", cache, exc_info=True)
+        return None
+
+
+def _write_disk_cache(path: Path, cache: Path, shapes: List[Tuple[base.BaseGeometry, Dict]]) -> None:
+    try:
+        cache.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache.with_suffix(f".{os.getpid()}.tmp")
+        entries = {
+            "wkb": shapely.to_wkb([shp for shp, _ in shapes], hex=True).tolist(),
+            "props": [props for _, props in shapes],
+        }
+        tmp.write_text(json.dumps(entries))
+        tmp.replace(cache)
+    except Exception:
+        logger.debug("Could not write geo cache %s", cache, exc_info=True)
+        return
+    # drop entries for older versions of the same source file (including
+    # pickles written by earlier releases)
+    prefix = _disk_cache_prefix(path)
+    for old in [*cache.parent.glob(f"{prefix}-*.wkb.json"), *cache.parent.glob(f"{prefix}-*.wkb.pkl")]:
+        if old != cache:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
 
 def _load_geojson(path: Path) -> List[Tuple[base.BaseGeometry, Dict]]:
     """Load a geojson file and return a list of (shapely_shape, properties)."""
+    cache = _disk_cache_path(path)
+    if cache is not None:
+        cached = _read_disk_cache(cache)
+        if cached is not None:
+            return cached
+    shapes_out = _parse_geojson(path)
+    if cache is not None and shapes_out:
+        _write_disk_cache(path, cache, shapes_out)
+    return shapes_out
+
+
+def _parse_geojson(path: Path) -> List[Tuple[base.BaseGeometry, Dict]]:
     try:
         raw = json.loads(path.read_text())
     except Exception:
@@ -114,4 +203,96 @@ def point_from_aircraft(item: dict) -> Optional[Point]:
         return Point(float(lon), float(lat))
     except Exception:
         return None
- 
\ No newline at end of file
+ 
+
+def aircraft_columns(aircraft: List[dict]) -> Dict[str, np.ndarray]:
+    """Extract per-aircraft columns from a list of VATSIM pilot dicts.
+
+    Returns a dict of equal-length arrays: "callsign" and "cid" (object),
+    "lat"/"lon" (float64, NaN when the position is missing or unparseable) and
+    "alt" (float64, NaN when unknown). Key fallbacks match point_from_aircraft.
+    """
+    n = len(aircraft)
+    lat = np.full(n, np.nan)
+    lon = np.full(n, np.nan)
+    alt = np.full(n, np.nan)
+    callsign = np.empty(n, dtype=object)
+    cid = np.empty(n, dtype=object)
+    for i, a in enumerate(aircraft):
+        callsign[i] = a.get("callsign")
+        cid[i] = a.get("cid")
+        y = a.get("latitude") or a.get("lat") or a.get("y")
+        x = a.get("longitude") or a.get("lon") or a.get("x")
+        if y is not None and x is not None:
+            try:
+                y, x = float(y), float(x)
+            except (TypeError, ValueError):
+                pass
+            else:
+                lat[i] = y
+                lon[i] = x
+        z = a.get("altitude") or a.get("alt")
+        if z is not None:
+            try:
+                alt[i] = float(z)
+            except (TypeError, ValueError):
+                pass
+    return {"callsign": callsign, "cid": cid, "lat": lat, "lon": lon, "alt": alt}
+
+
+def _line_tolerance(props: Optional[Dict], default: float) -> float:
+    """Return the feature's "tolerance" property, or `default` when missing or not numeric."""
+    try:
+        return float((props or {}).get("tolerance", default))
+    except (TypeError, ValueError):
+        return default
+
+
+def match_shapes_xy(shapes: List[Tuple[base.BaseGeometry, Dict]], lon: np.ndarray, lat: np.ndarray,
+                    line_tolerance: Optional[float] = None) -> np.ndarray:
+    """Return, for each (lon, lat) point, the index of the first shape it falls in, or -1.
+
+    A point counts as inside when it lies in the interior or on the boundary
+    (contains or touches). When `line_tolerance` is given, line geometries
+    instead match points within that many degrees; a "tolerance" property on
+    the feature overrides it.
+    """
+    matched = np.full(len(lon), -1, dtype=np.intp)
+    for k, (shp, props) in enumerate(shapes):
+        todo = np.flatnonzero(matched < 0)
+        if not len(todo):
+            break
+        try:
+            is_line = line_tolerance is not None and shp.geom_type in ("LineString", "MultiLineString")
+            tol = _line_tolerance(props, line_tolerance) if is_line else 0.0
+            # cheap bounding-box prefilter so GEOS only sees nearby points
+            minx, miny, maxx, maxy = shp.bounds
+            near = ((lon[todo] >= minx - tol) & (lon[todo] <= maxx + tol)
+                    & (lat[todo] >= miny - tol) & (lat[todo] <= maxy + tol))
+            todo = todo[near]
+            if not len(todo):
+                continue
+            if is_line:
+                hit = shapely.distance(shp, shapely.points(lon[todo], lat[todo])) <= tol
+            else:
+                shapely.prepare(shp)
+                hit = shapely.intersects_xy(shp, lon[todo], lat[todo])
+        except Exception:
+            logger.debug("Shape %d could not be tested", k, exc_info=True)
+            continue
+        matched[todo[hit]] = k
+    return matched
+
+
+def dca_range_nm(lat: np.ndarray, lon: np.ndarray) -> np.ndarray:
+    """Vectorized great-circle distance (nautical miles) from DCA; NaN in, NaN out.
+
+    Matches the range_nm of the scalar _dca_radial_range helpers in the API.
+    """
+    lat1 = math.radians(DCA_BULL[0])
+    lon1 = math.radians(DCA_BULL[1])
+    lat2 = np.radians(lat)
+    dlon = np.radians(lon) - lon1
+    a = np.sin((lat2 - lat1) / 2.0) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(dlon / 2.0) ** 2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(np.maximum(0.0, 1 - a)))
+    return 6371.0 * c / 1.852
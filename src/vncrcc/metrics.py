@@ -134,11 +134,12 @@ class MetricsTracker:
     def get_endpoint_stats(self) -> dict:
         """Get per-endpoint statistics."""
         stats = {}
+        now = time.time()
         for endpoint in self._requests:
             stats[endpoint] = {
-                "requests_1min": sum(1 for ts, _ in self._requests[endpoint] if ts > time.time() - 60),
-                "requests_5min": sum(1 for ts, _ in self._requests[endpoint] if ts > time.time() - 300),
-                "errors_1min": sum(1 for ts, _ in self._errors[endpoint] if ts > time.time() - 60),
+                "requests_1min": sum(1 for ts, _ in self._requests[endpoint] if ts > now - 60),
+                "requests_5min": sum(1 for ts, _ in self._requests[endpoint] if ts > now - 300),
+                "errors_1min": sum(1 for ts, _ in self._errors[endpoint] if ts > now - 60),
             }
         return stats
     
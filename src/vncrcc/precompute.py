@@ -17,7 +17,10 @@ from typing import Any, Dict, List, Optional
 from datetime import datetime
 import math
 
-from .geo.loader import find_geo_by_keyword, point_from_aircraft
+import numpy as np
+
+from . import storage
+from .geo.loader import aircraft_columns, dca_range_nm, find_geo_by_keyword, match_shapes_xy, point_from_aircraft
 
 logger = logging.getLogger("vncrcc.precompute")
 
@@ -66,13 +69,16 @@ def _dca_radial_range(lat: float, lon: float) -> dict:
     return {"radial_range": compact, "bearing": brng_i, "range_nm": round(dist_nm, 1)}
 
 
-def _compute_geofence(aircraft: List[Dict[str, Any]], geo_keyword: str, max_altitude: Optional[float] = None) -> List[Dict[str, Any]]:
-    """Compute which aircraft are inside a geofence using spatial indexing.
+def _compute_geofence(aircraft: List[Dict[str, Any]], geo_keyword: str, max_altitude: Optional[float] = None,
+                      columns: Optional[Dict[str, np.ndarray]] = None) -> List[Dict[str, Any]]:
+    """Compute which aircraft are inside a geofence.
 
     Args:
         aircraft: List of aircraft dicts from VATSIM data
         geo_keyword: Keyword to find geojson (e.g., "sfra", "frz", "p56")
         max_altitude: If set, filter out aircraft above this altitude (ft)
+        columns: Optional aircraft_columns(aircraft), so several geofences
+            can share one extraction pass
 
     Returns:
         List of matches with {"aircraft": {...}, "matched_props": {...}, "dca": {...}}
@@ -82,63 +88,22 @@ def _compute_geofence(aircraft: List[Dict[str, Any]], geo_keyword: str, max_alti
         logger.warning(f"No geo shapes found for keyword '{geo_keyword}'")
         return []
 
-    # Build spatial index (STRtree) for O(log n) lookups instead of O(n)
-    # Only create index if we have multiple shapes or many aircraft (worth the overhead)
-    try:
-        from shapely.strtree import STRtree
-        if len(shapes) > 1 or len(aircraft) > 50:
-            shape_geoms = [shp for shp, _ in shapes]
-            tree = STRtree(shape_geoms)
-        else:
-            tree = None
-    except Exception:
-        tree = None
-
-    inside: List[Dict[str, Any]] = []
-    for a in aircraft:
-        cid = a.get("cid") or a.get("callsign") or '<no-cid>'
-        pt = point_from_aircraft(a)
-        if not pt:
-            continue
+    if columns is None:
+        columns = aircraft_columns(aircraft)
+    lat, lon = columns["lat"], columns["lon"]
 
-        # altitude filter
-        if max_altitude is not None:
-            alt = a.get("altitude") or a.get("alt")
-            try:
-                alt_val = float(alt) if alt is not None else None
-            except Exception:
-                alt_val = None
-            if alt_val is None or alt_val > max_altitude:
-                continue
-
-        # Use spatial index if available
-        if tree:
-            try:
-                candidates = tree.query(pt)
-                for candidate_shp in candidates:
-                    if candidate_shp.contains(pt) or candidate_shp.touches(pt):
-                        # Find matching props for this shape
-                        for shp, props in shapes:
-                            if shp == candidate_shp:
-                                dca = _dca_radial_range(pt.y, pt.x)
-                                inside.append({"aircraft": a, "matched_props": props, "dca": dca})
-                                break
-                        break
-            except Exception:
-                pass  # Fallback to linear search
-        else:
-            # Linear search fallback for small datasets
-            for shp, props in shapes:
-                try:
-                    inside_match = shp.contains(pt) or shp.touches(pt)
-                except Exception:
-                    inside_match = False
-
-                if inside_match:
-                    dca = _dca_radial_range(pt.y, pt.x)
-                    inside.append({"aircraft": a, "matched_props": props, "dca": dca})
-                    break
+    # Position and altitude filters as one mask; NaN (unknown) compares False
+    keep = ~np.isnan(lat)
+    if max_altitude is not None:
+        keep &= columns["alt"] <= max_altitude
+    idx = np.flatnonzero(keep)
+    matched = match_shapes_xy(shapes, lon[idx], lat[idx])
 
+    inside: List[Dict[str, Any]] = []
+    for j in np.flatnonzero(matched >= 0):
+        i = idx[j]
+        dca = _dca_radial_range(float(lat[i]), float(lon[i]))
+        inside.append({"aircraft": aircraft[i], "matched_props": shapes[matched[j]][1], "dca": dca})
     return inside
 
 
@@ -154,16 +119,27 @@ def _detect_p56_intrusions(data: Dict[str, Any], ts: float) -> List[Dict[str, An
 
     PERF: All P56 history file I/O now batched into single write at end.
     """
-    from .storage import STORAGE
     from shapely.geometry import LineString, Point
+    from shapely.strtree import STRtree
     from .p56_history import sync_snapshot_with_penetrations
     import os
 
     shapes = find_geo_by_keyword("p56")
-    if not shapes or not STORAGE:
+    if not shapes or not storage.STORAGE:
         return []
+    # Bounding-box index over the zones: most aircraft are nowhere near P-56,
+    # so the exact predicates only run for candidates the tree returns
+    tree = STRtree([shp for shp, _ in shapes])
+    zone_names = [props.get("name") or props.get("id") or "P-56" for _, props in shapes]
+
+    def _zones_hit(geom: Any, predicate: str = "intersects") -> List[int]:
+        # tree.query returns indices in tree order; keep the shapes' order
+        try:
+            return sorted(tree.query(geom, predicate=predicate).tolist())
+        except Exception:
+            return []
 
-    snaps = STORAGE.get_latest_snapshots(2)
+    snaps = storage.STORAGE.get_latest_snapshots(2)
     if len(snaps) < 2:
         return []
 
@@ -215,9 +191,7 @@ def _detect_p56_intrusions(data: Dict[str, Any], ts: float) -> List[Dict[str, An
         ident = str(a.get("cid") or a.get("callsign") or "")
         if not ident:
             continue
-        pt = point_from_aircraft(a)
-        if not pt:
-            continue
+        # altitude first: most traffic is above FL180, so skip building a Point for it
         alt = a.get("altitude") or a.get("alt")
         try:
             alt_val = float(alt) if alt is not None else None
@@ -225,6 +199,9 @@ def _detect_p56_intrusions(data: Dict[str, Any], ts: float) -> List[Dict[str, An
             alt_val = None
         if alt_val is None or alt_val > 17999:
             continue
+        pt = point_from_aircraft(a)
+        if not pt:
+            continue
         prev_map[ident] = {"pos": (pt.x, pt.y)}
 
     breaches: List[Dict[str, Any]] = []
@@ -234,9 +211,6 @@ def _detect_p56_intrusions(data: Dict[str, Any], ts: float) -> List[Dict[str, An
         ident = str(a.get("cid") or a.get("callsign") or "")
         if not ident:
             continue
-        latest_pt = point_from_aircraft(a)
-        if not latest_pt:
-            continue
         alt = a.get("altitude") or a.get("alt")
         try:
             alt_val = float(alt) if alt is not None else None
@@ -244,6 +218,9 @@ def _detect_p56_intrusions(data: Dict[str, Any], ts: float) -> List[Dict[str, An
             alt_val = None
         if alt_val is None or alt_val > 17999:
             continue
+        latest_pt = point_from_aircraft(a)
+        if not latest_pt:
+            continue
 
         matched_zones: List[str] = []
         line = None
@@ -251,36 +228,17 @@ def _detect_p56_intrusions(data: Dict[str, Any], ts: float) -> List[Dict[str, An
         if ident in prev_map:
             px, py = prev_map[ident]["pos"]
             line = LineString([(px, py), (latest_pt.x, latest_pt.y)])
-            for shp, props in shapes:
-                zone_name = props.get("name") or props.get("id") or "P-56"
-                try:
-                    if shp.intersects(line):
-                        matched_zones.append(zone_name)
-                except Exception:
-                    continue
+            matched_zones = [zone_names[k] for k in _zones_hit(line)]
 
         # if not crossed, check connect-inside
         if not matched_zones:
-            latest_inside = []
-            for shp, props in shapes:
-                zone_name = props.get("name") or props.get("id") or "P-56"
-                try:
-                    if shp.contains(latest_pt) or shp.intersects(latest_pt):
-                        latest_inside.append(zone_name)
-                except Exception:
-                    continue
+            # contains-or-intersects reduces to intersects for a point
+            latest_inside = [zone_names[k] for k in _zones_hit(latest_pt)]
             if latest_inside:
                 if ident in prev_map:
-                    # verify not already inside previously
+                    # verify not already inside previously (zone contains point)
                     px, py = prev_map[ident]["pos"]
-                    prev_inside = False
-                    for shp, _ in shapes:
-                        try:
-                            if shp.contains(Point(px, py)):
-                                prev_inside = True
-                                break
-                        except Exception:
-                            continue
+                    prev_inside = bool(_zones_hit(Point(px, py), "within"))
                     if not prev_inside:
                         matched_zones = latest_inside
                 else:
@@ -342,9 +300,12 @@ def _detect_p56_intrusions(data: Dict[str, Any], ts: float) -> List[Dict[str, An
     return breaches
 
 
-def precompute_all(data: Dict[str, Any], ts: float) -> None:
+def precompute_all(data: Dict[str, Any], ts: float, pilots: Optional[List[Dict[str, Any]]] = None) -> None:
     """Pre-compute all expensive operations after a VATSIM fetch.
 
+    `pilots` is the pilot list already resolved by the fetcher; it is derived
+    from `data` when omitted.
+
     This runs synchronously in the fetch callback, so keep it fast.
     If computation takes >1s, consider offloading to a thread pool.
     
@@ -360,19 +321,20 @@ def precompute_all(data: Dict[str, Any], ts: float) -> None:
             general = data.get("general", {})
             update_str = general.get("update_timestamp") or general.get("update")
             if update_str:
-                from datetime import datetime as dt
                 if 'T' in update_str or '-' in update_str:
-                    vatsim_dt = dt.fromisoformat(update_str.replace('Z', '+00:00'))
+                    vatsim_dt = datetime.fromisoformat(update_str.replace('Z', '+00:00'))
                 else:
                     y, m, d, h, mi, s = update_str[:4], update_str[4:6], update_str[6:8], update_str[8:10], update_str[10:12], update_str[12:14]
-                    vatsim_dt = dt.strptime(f"{y}-{m}-{d}T{h}:{mi}:{s}Z", "%Y-%m-%dT%H:%M:%SZ")
+                    vatsim_dt = datetime.strptime(f"{y}-{m}-{d}T{h}:{mi}:{s}Z", "%Y-%m-%dT%H:%M:%SZ")
                 vatsim_update_ts = vatsim_dt.timestamp()
                 delay_from_vatsim = ts - vatsim_update_ts
                 logger.info(f"[TIMING] Precompute started {delay_from_vatsim:.1f}s after VATSIM update")
         except Exception:
             pass
         
-        aircraft = data.get("pilots") or data.get("aircraft") or []
+        if pilots is None:
+            pilots = data.get("pilots") or data.get("aircraft") or []
+        aircraft = pilots
         total_aircraft = len(aircraft)
         
         # Dynamic radius adjustment for event surge protection
@@ -385,21 +347,16 @@ def precompute_all(data: Dict[str, Any], ts: float) -> None:
             effective_radius = min(_TRIM_RADIUS_NM, 150)  # Reduce to 150nm during large events
             logger.info(f"High traffic detected: {total_aircraft} aircraft, reducing radius to {effective_radius}nm")
         
+        # Extract positions/altitudes once; the trim and every geofence below
+        # work on these columns instead of re-reading each pilot dict
+        columns = aircraft_columns(aircraft)
+
         # Trim dataset to within configured radius of DCA to minimize processing
         if aircraft and effective_radius and effective_radius > 0:
-            trimmed: List[Dict[str, Any]] = []
-            for a in aircraft:
-                try:
-                    lat = a.get("latitude") or a.get("lat") or a.get("y")
-                    lon = a.get("longitude") or a.get("lon") or a.get("x")
-                    if lat is None or lon is None:
-                        continue
-                    d = _dca_radial_range(float(lat), float(lon))
-                    if d.get("range_nm", 1e9) <= effective_radius:
-                        trimmed.append(a)
-                except Exception:
-                    continue
-            aircraft = trimmed
+            with np.errstate(invalid="ignore"):
+                keep = np.round(dca_range_nm(columns["lat"], columns["lon"]), 1) <= effective_radius
+            aircraft = [aircraft[i] for i in np.flatnonzero(keep)]
+            columns = {k: v[keep] for k, v in columns.items()}
         count = len(aircraft)
         
         # Store surge mode status in cache for /api/status endpoint
@@ -413,7 +370,7 @@ def precompute_all(data: Dict[str, Any], ts: float) -> None:
         }
 
         # Compute SFRA violations (altitude <= 17999 ft)
-        sfra_results = _compute_geofence(aircraft, "sfra", max_altitude=17999)
+        sfra_results = _compute_geofence(aircraft, "sfra", max_altitude=17999, columns=columns)
         _CACHE["sfra"] = {
             "aircraft": sfra_results,
             "computed_at": ts,
@@ -421,7 +378,7 @@ def precompute_all(data: Dict[str, Any], ts: float) -> None:
         }
 
         # Compute FRZ violations (altitude <= 17999 ft)
-        frz_results = _compute_geofence(aircraft, "frz", max_altitude=17999)
+        frz_results = _compute_geofence(aircraft, "frz", max_altitude=17999, columns=columns)
         _CACHE["frz"] = {
             "aircraft": frz_results,
             "computed_at": ts,
@@ -457,8 +414,7 @@ def precompute_all(data: Dict[str, Any], ts: float) -> None:
         # Compute VIP aircraft (scan all pilots globally, no range restriction)
         try:
             from .vip_activity import detect_vip_aircraft
-            all_pilots = data.get("pilots") or data.get("aircraft") or []
-            vip_aircraft = detect_vip_aircraft(all_pilots)
+            vip_aircraft = detect_vip_aircraft(pilots)
             _CACHE["vip"] = {
                 "aircraft": vip_aircraft,
                 "count": len(vip_aircraft),
@@ -1,25 +1,95 @@
+import functools
 import json
+import logging
 import os
+import threading
 import time
 from typing import Any, Dict, List, Optional
 
 import sqlite3
 from sqlalchemy import (
     create_engine,
+    event,
     MetaData,
     Table,
     Column,
     Integer,
     Float,
+    Index,
     Text,
     String,
     JSON,
+    LargeBinary,
     select,
     insert,
+    delete,
     text,
+    bindparam,
+    func,
 )
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import QueuePool, StaticPool
+
+logger = logging.getLogger("vncrcc.storage")
+
+try:
+    import zstandard as zstd
+except Exception:  # pragma: no cover - optional dependency
+    zstd = None
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+if orjson is not None:
+    def _json_dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    _json_loads = orjson.loads
+    # orjson >= 3.9: embeds already-serialized JSON verbatim
+    _JsonFragment = getattr(orjson, "Fragment", None)
+else:
+    def _json_dumps(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+    _json_loads = json.loads
+    _JsonFragment = None
+
+
+def _json_column_dumps(obj: Any) -> str:
+    # SQLAlchemy's JSON type binds the serializer's str result
+    return _json_dumps(obj).decode()
+
+
+# Column order of position history rows/arrays
+_HISTORY_FIELDS = ("timestamp", "latitude", "longitude", "altitude", "groundspeed", "heading")
+# Column order of the per-aircraft rows written to aircraft_positions
+_AIRCRAFT_FIELDS = ("cid", "callsign", "latitude", "longitude", "altitude", "groundspeed", "heading")
+
+
+def _history_arrays(rows: List[tuple]) -> Dict[str, Any]:
+    """Turn (timestamp, lat, lon, alt, gs, hdg) rows into float64 columns."""
+    import numpy as np
+
+    cols = list(zip(*rows)) or [()] * len(_HISTORY_FIELDS)
+    return {k: np.asarray(c, dtype=np.float64) for k, c in zip(_HISTORY_FIELDS, cols)}
+
+
+# Frame magic number used to tell compressed snapshots from legacy JSON
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+
+def _sqlite_pragmas(dbapi_conn, connection_record) -> None:
+    """Configure each new pooled sqlite connection: WAL + NORMAL sync."""
+    cur = dbapi_conn.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA busy_timeout=5000")
+    cur.execute("PRAGMA cache_size=-32000")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.close()
 
 
 class Storage:
@@ -30,6 +100,11 @@ class Storage:
     implementation falls back to SQLite file `vncrcc.db`.
     """
 
+    # Position history is kept for this many polls and trimmed every
+    # POSITION_CLEANUP_EVERY saves
+    POSITION_POLLS_KEEP = 10
+    POSITION_CLEANUP_EVERY = 10
+
     def __init__(self, db_url: Optional[str] = None, db_path: Optional[str] = None) -> None:
         # Backwards-compatible constructor: callers may pass `db_path` (old
         # sqlite-based code/tests) or `db_url` (SQLAlchemy URL). Priority:
@@ -55,13 +130,30 @@ class Storage:
         # For sqlite, allow check_same_thread via connect_args; SQLAlchemy will
         # handle that automatically if requested.
         connect_args = {}
+        pool_args: Dict[str, Any] = {}
         if url.startswith("sqlite:"):
+            # Position history queries use window functions
+            if sqlite3.sqlite_version_info < (3, 25, 0):
+                raise RuntimeError(f"SQLite {sqlite3.sqlite_version} is too old; 3.25+ is required")
             connect_args = {"check_same_thread": False}
+            if ":memory:" in url or url.rstrip("/") == "sqlite:":
+                # One shared connection, otherwise each thread would see its
+                # own empty in-memory database
+                pool_args = {"poolclass": StaticPool}
+            else:
+                # WAL lets readers run alongside the writer; give each
+                # concurrent request its own connection
+                pool_args = {"poolclass": QueuePool, "pool_size": max(4, os.cpu_count() or 1), "max_overflow": 8}
         else:
             connect_args = {}
 
         # Create engine and metadata
-        self.engine: Engine = create_engine(url, future=True, connect_args=connect_args)
+        self.engine: Engine = create_engine(
+            url, future=True, connect_args=connect_args, **pool_args,
+            json_serializer=_json_column_dumps, json_deserializer=_json_loads,
+        )
+        if url.startswith("sqlite:"):
+            event.listen(self.engine, "connect", _sqlite_pragmas)
         self.metadata = MetaData()
 
         # Backwards compatibility: if caller supplied a db_path (legacy), expose
@@ -86,6 +178,12 @@ class Storage:
         except Exception:
             self.conn = None
 
+        # On sqlite snapshots are stored zstd-compressed (VATSIM JSON shrinks
+        # ~10x); other backends keep a JSON column, which they compress
+        # themselves.
+        self._zc = zstd.ZstdCompressor(level=3) if zstd is not None and url.startswith("sqlite:") else None
+        self._zc_lock = threading.Lock()
+
         # Tables
         # snapshots: store raw JSON blob per fetch
         self.snapshots = Table(
@@ -93,7 +191,7 @@ class Storage:
             self.metadata,
             Column("id", Integer, primary_key=True),
             Column("fetched_at", Float, nullable=False),
-            Column("raw_json", JSON, nullable=False),
+            Column("raw_json", LargeBinary if self._zc is not None else JSON, nullable=False),
         )
 
         # incidents
@@ -117,14 +215,16 @@ class Storage:
             "aircraft_positions",
             self.metadata,
             Column("id", Integer, primary_key=True),
-            Column("cid", Integer, index=True),
+            Column("cid", Integer),
             Column("callsign", String),
-            Column("timestamp", Float),
+            Column("timestamp", Float, index=True),
             Column("latitude", Float),
             Column("longitude", Float),
             Column("altitude", Float),
             Column("groundspeed", Float),
             Column("heading", Float),
+            # History reads are "newest N for a cid": served straight off this index
+            Index("ix_ap_cid_ts", "cid", text("timestamp DESC")),
         )
 
         # classifications: store precomputed SFRA/FRZ/P56 summaries per snapshot
@@ -137,9 +237,64 @@ class Storage:
             Column("summary_json", JSON),
         )
 
+        # Hot statements are built once so each call skips constructing them
+        snap, pos, inc = self.snapshots.c, self.aircraft_positions.c, self.incidents.c
+        self._ins_snapshot = insert(self.snapshots)
+        self._ins_positions = insert(self.aircraft_positions)
+        # On sqlite the whole batch is bound as one JSON array of
+        # [cid, callsign, lat, lon, alt, gs, hdg] rows and unpacked by json_each,
+        # instead of crossing into the driver once per row
+        self._is_sqlite = url.startswith("sqlite:")
+        self._ins_positions_json = text("""
+            INSERT INTO aircraft_positions (cid, callsign, timestamp, latitude, longitude, altitude, groundspeed, heading)
+            SELECT json_extract(value, '$[0]'), json_extract(value, '$[1]'), :ts,
+                   json_extract(value, '$[2]'), json_extract(value, '$[3]'), json_extract(value, '$[4]'),
+                   json_extract(value, '$[5]'), json_extract(value, '$[6]')
+            FROM json_each(:payload)
+        """)
+        self._ins_incident = insert(self.incidents)
+        self._stmt_snapshots = select(snap.raw_json, snap.fetched_at).order_by(snap.fetched_at.desc()).limit(bindparam("lim"))
+        self._stmt_history = (
+            select(pos.timestamp, pos.latitude, pos.longitude, pos.altitude, pos.groundspeed, pos.heading)
+            .where(pos.cid == bindparam("cid"))
+            .order_by(pos.timestamp.desc())
+            .limit(bindparam("lim"))
+        )
+        # Newest `lim` positions for each of several cids in one round-trip
+        rn = func.row_number().over(partition_by=pos.cid, order_by=pos.timestamp.desc()).label("rn")
+        ranked = (
+            select(pos.cid, pos.timestamp, pos.latitude, pos.longitude, pos.altitude, pos.groundspeed, pos.heading, rn)
+            .where(pos.cid.in_(bindparam("cids", expanding=True)))
+            .subquery()
+        )
+        self._stmt_history_many = (
+            select(ranked.c.cid, ranked.c.timestamp, ranked.c.latitude, ranked.c.longitude, ranked.c.altitude, ranked.c.groundspeed, ranked.c.heading)
+            .where(ranked.c.rn <= bindparam("lim"))
+            .order_by(ranked.c.cid, ranked.c.timestamp.desc())
+        )
+        self._stmt_incidents = (
+            select(inc.id, inc.detected_at, inc.callsign, inc.cid, inc.name, inc.lat, inc.lon, inc.altitude, inc.zone, inc.evidence)
+            .order_by(inc.detected_at.desc())
+            .limit(bindparam("lim"))
+        )
+
+        # In-process read caches, invalidated by bumping _latest_version
+        # whenever save_snapshot commits.
+        self._cache_lock = threading.Lock()
+        self._latest_version = 0
+        self._latest_cache: Optional[Dict[str, Any]] = None
+        self._list_aircraft_cache: tuple = (None, -1)
+        self._positions_since_cleanup = 0
+
         # Create tables if they don't exist
         try:
             self.metadata.create_all(self.engine)
+            # create_all skips indexes on tables that already exist
+            for idx in self.aircraft_positions.indexes:
+                idx.create(self.engine, checkfirst=True)
+            with self.engine.begin() as conn:
+                # Superseded by ix_ap_cid_ts
+                conn.execute(text("DROP INDEX IF EXISTS ix_aircraft_positions_cid"))
         except SQLAlchemyError:
             # If create_all fails (rare), ignore and let runtime operations fail
             pass
@@ -147,51 +302,101 @@ class Storage:
     def _conn(self):
         return self.engine.connect()
 
-    def save_snapshot(self, data: Dict[str, Any], fetched_at: Optional[float] = None) -> int:
+    def close(self) -> None:
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        self.engine.dispose()
+
+    def _encode_snapshot(self, data: Dict[str, Any], raw: Optional["bytes | bytearray"] = None) -> Any:
+        # `raw` is the JSON text `data` was parsed from; reuse it rather than
+        # serializing the dict again
+        if self._zc is None:
+            if raw is not None and _JsonFragment is not None:
+                return _JsonFragment(bytes(raw))
+            return data
+        payload = raw if raw is not None else _json_dumps(data)
+        with self._zc_lock:
+            return self._zc.compress(payload)
+
+    @staticmethod
+    def _decode_snapshot(raw: Any) -> Any:
+        # Accepts compressed bytes, legacy JSON text, or an already-decoded
+        # value from a JSON column.
+        if isinstance(raw, (bytes, memoryview)):
+            raw = bytes(raw)
+            if raw[:4] == _ZSTD_MAGIC:
+                if zstd is None:
+                    raise RuntimeError("payload is zstd-compressed but zstandard is not installed")
+                raw = zstd.ZstdDecompressor().decompress(raw)
+            return _json_loads(raw)
+        if isinstance(raw, str):
+            return _json_loads(raw)
+        return raw
+
+    def save_snapshot(self, data: Dict[str, Any], fetched_at: Optional[float] = None,
+                      raw: Optional["bytes | bytearray"] = None) -> int:
+        """Store a feed snapshot and its positions; returns the snapshot id.
+
+        Pass `raw`, the JSON body `data` was parsed from, to store it as-is.
+        """
         if fetched_at is None:
             fetched_at = time.time()
         try:
-            with self._conn() as conn:
-                result = conn.execute(insert(self.snapshots).values(fetched_at=fetched_at, raw_json=data))
-                conn.commit()
+            # One transaction covers the snapshot, its positions and cleanup
+            with self.engine.begin() as conn:
+                result = conn.execute(self._ins_snapshot, {"fetched_at": fetched_at, "raw_json": self._encode_snapshot(data, raw)})
                 sid = int(result.inserted_primary_key[0]) if result.inserted_primary_key else 0
                 # save aircraft positions
                 self._save_aircraft_positions(conn, data, fetched_at)
                 # cleanup old snapshots
                 self._cleanup_old_snapshots(conn)
-                return sid
-        except Exception:
+        except SQLAlchemyError:
+            logger.warning("Failed to save snapshot", exc_info=True)
             return 0
+        with self._cache_lock:
+            self._latest_version += 1
+            self._latest_cache = None
+        return sid
 
     def get_latest_snapshot(self) -> Optional[Dict[str, Any]]:
+        with self._cache_lock:
+            if self._latest_cache is not None:
+                return self._latest_cache
+            version = self._latest_version
         try:
             with self._conn() as conn:
-                stmt = select(self.snapshots.c.raw_json, self.snapshots.c.fetched_at).order_by(self.snapshots.c.fetched_at.desc()).limit(1)
-                row = conn.execute(stmt).fetchone()
-                if not row:
-                    return None
-                raw, ts = row
-                return {"data": raw, "fetched_at": ts}
-        except Exception:
+                row = conn.execute(self._stmt_snapshots, {"lim": 1}).fetchone()
+            if not row:
+                return None
+            raw, ts = row
+            snap = {"data": self._decode_snapshot(raw), "fetched_at": ts}
+        except SQLAlchemyError:
+            logger.warning("Failed to read latest snapshot", exc_info=True)
             return None
+        with self._cache_lock:
+            # Don't cache a row read before a concurrent save_snapshot committed
+            if self._latest_version == version:
+                self._latest_cache = snap
+        return snap
 
     def list_snapshots(self, limit: int = 10) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
         try:
             with self._conn() as conn:
-                stmt = select(self.snapshots.c.raw_json, self.snapshots.c.fetched_at).order_by(self.snapshots.c.fetched_at.desc()).limit(limit)
-                rows = conn.execute(stmt).fetchall()
+                rows = conn.execute(self._stmt_snapshots, {"lim": limit}).fetchall()
                 for raw, ts in rows:
-                    out.append({"data": raw, "fetched_at": ts})
-        except Exception:
-            pass
+                    out.append({"data": self._decode_snapshot(raw), "fetched_at": ts})
+        except SQLAlchemyError:
+            logger.warning("Failed to list snapshots", exc_info=True)
         return out
 
     def get_latest_snapshots(self, n: int = 2) -> List[Dict[str, Any]]:
         return self.list_snapshots(limit=n)
 
     def _cleanup_old_snapshots(self, conn, keep_recent: int = 100) -> None:
-        # Keep only most recent N snapshots
+        # Keep only most recent N snapshots. Best-effort: the savepoint keeps
+        # a failure here from rolling back the caller's transaction.
         try:
             # Delete older snapshots not in the newest N
             sql = text("""
@@ -202,70 +407,65 @@ class Storage:
                     LIMIT :keep
                 )
             """)
-            conn.execute(sql, {"keep": keep_recent})
-            conn.commit()
-        except Exception:
-            pass
+            with conn.begin_nested():
+                conn.execute(sql, {"keep": keep_recent})
+        except SQLAlchemyError:
+            logger.warning("Snapshot cleanup failed", exc_info=True)
 
     def _save_aircraft_positions(self, conn, data: Dict[str, Any], timestamp: float) -> None:
         aircraft = data.get("pilots") or data.get("aircraft") or []
-        try:
-            for ac in aircraft:
-                try:
-                    cid = ac.get("cid")
-                    callsign = ac.get("callsign")
-                    lat = ac.get("latitude") or ac.get("lat")
-                    lon = ac.get("longitude") or ac.get("lon")
-                    alt = ac.get("altitude")
-                    gs = ac.get("groundspeed")
-                    heading = ac.get("heading")
-                    if cid is not None and lat is not None and lon is not None:
-                        conn.execute(insert(self.aircraft_positions).values(
-                            cid=cid, callsign=callsign, timestamp=timestamp,
-                            latitude=lat, longitude=lon, altitude=alt,
-                            groundspeed=gs, heading=heading
-                        ))
-                except Exception:
-                    continue
-            conn.commit()
-            # cleanup old positions
+        rows: List[tuple] = []
+        for ac in aircraft:
+            cid = ac.get("cid")
+            lat = ac.get("latitude") or ac.get("lat")
+            lon = ac.get("longitude") or ac.get("lon")
+            if cid is not None and lat is not None and lon is not None:
+                rows.append((cid, ac.get("callsign"), lat, lon, ac.get("altitude"), ac.get("groundspeed"), ac.get("heading")))
+        if rows:
+            try:
+                with conn.begin_nested():
+                    if self._is_sqlite:
+                        conn.execute(self._ins_positions_json, {"ts": timestamp, "payload": _json_dumps(rows).decode()})
+                    else:
+                        # A list of parameter dicts runs as a single executemany
+                        keys = _AIRCRAFT_FIELDS
+                        conn.execute(self._ins_positions, [dict(zip(keys, r), timestamp=timestamp) for r in rows])
+            except SQLAlchemyError:
+                logger.warning("Failed to save aircraft positions", exc_info=True)
+        # cleanup old positions
+        self._positions_since_cleanup += 1
+        if self._positions_since_cleanup >= self.POSITION_CLEANUP_EVERY:
             self._cleanup_old_positions(conn)
-        except Exception:
-            pass
+            self._positions_since_cleanup = 0
 
     def _cleanup_old_positions(self, conn) -> None:
-        # Keep only the most recent 10 positions per aircraft. Use a window function
-        # if supported by the DB. We run raw SQL for portability; Postgres supports
-        # the subquery; SQLite 3.25+ supports window functions.
+        # Each poll writes one row per aircraft stamped with the snapshot's
+        # fetched_at, so dropping rows older than the Nth newest snapshot keeps
+        # the last N positions per aircraft with a range delete on timestamp.
         try:
             sql = text("""
                 DELETE FROM aircraft_positions
-                WHERE id NOT IN (
-                    SELECT id FROM (
-                        SELECT id, ROW_NUMBER() OVER (PARTITION BY cid ORDER BY timestamp DESC) as rn
-                        FROM aircraft_positions
-                    ) t WHERE rn <= 10
+                WHERE timestamp < (
+                    SELECT fetched_at FROM snapshots
+                    ORDER BY fetched_at DESC
+                    LIMIT 1 OFFSET :skip
                 )
             """)
-            conn.execute(sql)
-            conn.commit()
-        except Exception:
-            # If window functions aren't available, fallback: keep latest 10 per cid by iterative approach
-            try:
-                # naive fallback: delete older than timestamp threshold for simplicity (best-effort)
-                conn.execute(text("VACUUM"))
-            except Exception:
-                pass
+            with conn.begin_nested():
+                conn.execute(sql, {"skip": self.POSITION_POLLS_KEEP - 1})
+        except SQLAlchemyError:
+            logger.warning("Position cleanup failed", exc_info=True)
 
     def save_incident(self, detected_at: float, callsign: str, cid: Optional[int], lat: float, lon: float, altitude: Optional[float], zone: str, evidence: str, name: Optional[str] = None) -> int:
         try:
             with self._conn() as conn:
-                result = conn.execute(insert(self.incidents).values(
-                    detected_at=detected_at, callsign=callsign, cid=cid, name=name, lat=lat, lon=lon, altitude=altitude, zone=zone, evidence=evidence
-                ))
+                result = conn.execute(self._ins_incident, {
+                    "detected_at": detected_at, "callsign": callsign, "cid": cid, "name": name, "lat": lat, "lon": lon, "altitude": altitude, "zone": zone, "evidence": evidence,
+                })
                 conn.commit()
                 return int(result.inserted_primary_key[0]) if result.inserted_primary_key else 0
-        except Exception:
+        except SQLAlchemyError:
+            logger.warning("Failed to save incident", exc_info=True)
             return 0
 
     def update_incident(self, id: int, evidence: str) -> None:
@@ -273,27 +473,69 @@ class Storage:
             with self._conn() as conn:
                 conn.execute(text("UPDATE incidents SET evidence = :e WHERE id = :id"), {"e": evidence, "id": id})
                 conn.commit()
-        except Exception:
-            pass
+        except SQLAlchemyError:
+            logger.warning("Failed to update incident %s", id, exc_info=True)
+
+    def delete_incidents(self, ids: List[int]) -> int:
+        """Delete incidents by id; returns how many rows were removed."""
+        ids = list(ids)
+        if not ids:
+            return 0
+        try:
+            with self.engine.begin() as conn:
+                result = conn.execute(delete(self.incidents).where(self.incidents.c.id.in_(ids)))
+                return result.rowcount or 0
+        except SQLAlchemyError:
+            logger.warning("Failed to delete incidents", exc_info=True)
+            return 0
+
+    def _position_history_rows(self, cid: int, limit: int) -> List[tuple]:
+        try:
+            with self._conn() as conn:
+                return [tuple(r) for r in conn.execute(self._stmt_history, {"cid": cid, "lim": limit}).fetchall()]
+        except SQLAlchemyError:
+            logger.warning("Failed to read position history", exc_info=True)
+            return []
 
     def get_aircraft_position_history(self, cid: int, limit: int = 10) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
+        for ts, lat, lon, alt, gs, hdg in self._position_history_rows(cid, limit):
+            out.append({"timestamp": ts, "latitude": lat, "longitude": lon, "altitude": alt, "groundspeed": gs, "heading": hdg})
+        return out
+
+    def get_aircraft_position_history_arrays(self, cid: int, limit: int = 10) -> Dict[str, Any]:
+        """Column-oriented variant of get_aircraft_position_history().
+
+        Returns {"timestamp": ndarray, "latitude": ndarray, ...} (float64,
+        newest first, NaN for missing values) for vectorized consumers.
+        """
+        return _history_arrays(self._position_history_rows(cid, limit))
+
+    def get_positions_for_cids(self, cids: List[int], per_cid: int = 10) -> Dict[int, List[Dict[str, Any]]]:
+        """Return the latest `per_cid` positions for each cid in one query.
+
+        Use this instead of calling get_aircraft_position_history() per
+        aircraft; cids with no stored positions are absent from the result.
+        """
+        out: Dict[int, List[Dict[str, Any]]] = {}
+        if not cids:
+            return out
         try:
             with self._conn() as conn:
-                stmt = select(self.aircraft_positions.c.timestamp, self.aircraft_positions.c.latitude, self.aircraft_positions.c.longitude, self.aircraft_positions.c.altitude, self.aircraft_positions.c.groundspeed, self.aircraft_positions.c.heading).where(self.aircraft_positions.c.cid == cid).order_by(self.aircraft_positions.c.timestamp.desc()).limit(limit)
-                rows = conn.execute(stmt).fetchall()
-                for ts, lat, lon, alt, gs, hdg in rows:
-                    out.append({"timestamp": ts, "latitude": lat, "longitude": lon, "altitude": alt, "groundspeed": gs, "heading": hdg})
-        except Exception:
-            pass
+                rows = conn.execute(self._stmt_history_many, {"cids": list(cids), "lim": per_cid}).fetchall()
+        except SQLAlchemyError:
+            logger.warning("Failed to read position history", exc_info=True)
+            return out
+        keys = _HISTORY_FIELDS
+        for row in rows:
+            out.setdefault(row[0], []).append(dict(zip(keys, row[1:])))
         return out
 
     def list_incidents(self, limit: int = 100) -> List[Dict[str, Any]]:
         out: List[Dict[str, Any]] = []
         try:
             with self._conn() as conn:
-                stmt = select(self.incidents.c.id, self.incidents.c.detected_at, self.incidents.c.callsign, self.incidents.c.cid, self.incidents.c.name, self.incidents.c.lat, self.incidents.c.lon, self.incidents.c.altitude, self.incidents.c.zone, self.incidents.c.evidence).order_by(self.incidents.c.detected_at.desc()).limit(limit)
-                rows = conn.execute(stmt).fetchall()
+                rows = conn.execute(self._stmt_incidents, {"lim": limit}).fetchall()
                 for row in rows:
                     out.append({
                         "id": row[0],
@@ -307,24 +549,30 @@ class Storage:
                         "zone": row[8],
                         "evidence": row[9]
                     })
-        except Exception:
-            pass
+        except SQLAlchemyError:
+            logger.warning("Failed to list incidents", exc_info=True)
         return out
 
     def list_aircraft(self) -> List[Dict[str, Any]]:
+        """Return the latest snapshot's VATSIM pilot records.
+
+        Each record is a shallow copy with a `position_history` list added,
+        fetched for all aircraft in one query.
+        """
+        with self._cache_lock:
+            cached, version = self._list_aircraft_cache
+            if version == self._latest_version:
+                return cached
+            version = self._latest_version
         snap = self.get_latest_snapshot()
-        if not snap:
-            return []
-        data = snap.get("data")
-        if not data:
-            return []
-        aircraft = data.get("pilots") or data.get("aircraft") or []
-        for ac in aircraft:
-            cid = ac.get("cid")
-            if cid is not None:
-                ac["position_history"] = self.get_aircraft_position_history(cid, 10)
-            else:
-                ac["position_history"] = []
+        data = (snap or {}).get("data") or {}
+        pilots = data.get("pilots") or data.get("aircraft") or []
+        history = self.get_positions_for_cids([ac["cid"] for ac in pilots if ac.get("cid") is not None], 10)
+        # copies, so the cached snapshot's records are left untouched
+        aircraft = [dict(ac, position_history=history.get(ac.get("cid"), [])) for ac in pilots]
+        with self._cache_lock:
+            if self._latest_version == version:
+                self._list_aircraft_cache = (aircraft, version)
         return aircraft
 
     # classifications helpers
@@ -333,8 +581,8 @@ class Storage:
             with self._conn() as conn:
                 conn.execute(insert(self.classifications).values(snapshot_id=snapshot_id, type=typ, summary_json=summary))
                 conn.commit()
-        except Exception:
-            pass
+        except SQLAlchemyError:
+            logger.warning("Failed to save %s classification", typ, exc_info=True)
 
     def get_latest_classification(self, typ: str) -> Optional[Any]:
         try:
@@ -344,14 +592,26 @@ class Storage:
                 if not row:
                     return None
                 return row[0]
-        except Exception:
+        except SQLAlchemyError:
+            logger.warning("Failed to read %s classification", typ, exc_info=True)
             return None
 
 
-# Module-level default STORAGE singleton
-try:
-    STORAGE = Storage()
-except Exception:
-    STORAGE = None
+@functools.cache
+def get_storage() -> Optional[Storage]:
+    """Return the shared default Storage, opening it on first use."""
+    try:
+        return Storage()
+    except Exception:
+        logger.exception("Failed to open default storage")
+        return None
+
+
+def __getattr__(name: str) -> Any:
+    # Resolve `STORAGE` lazily so importing the module does not open the database.
+    if name == "STORAGE":
+        return get_storage()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-__all__ = ["Storage", "STORAGE"]
+__all__ = ["Storage", "STORAGE", "get_storage"]
@@ -1,9 +1,14 @@
 import asyncio
+import hashlib
+import json
 import time
+from calendar import timegm
 from contextlib import suppress
+from datetime import datetime
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import aiohttp
+import socket
 import ssl
 import os
 import logging
@@ -11,9 +16,88 @@ try:
     import certifi
 except Exception:  # pragma: no cover - optional dependency
     certifi = None
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+try:
+    # aiohttp decodes br responses only when one of these is importable
+    import brotli  # noqa: F401
+    _HAS_BROTLI = True
+except ImportError:  # pragma: no cover - optional dependency
+    try:
+        import brotlicffi  # noqa: F401
+        _HAS_BROTLI = True
+    except ImportError:
+        _HAS_BROTLI = False
+try:
+    from .metrics import METRICS
+except ImportError:  # pragma: no cover - psutil missing
+    METRICS = None
 
 logger = logging.getLogger("vncrcc.vatsim")
 
+# Only advertise encodings aiohttp can decode here
+_ACCEPT_ENCODING = "gzip, br" if _HAS_BROTLI else "gzip, deflate"
+
+# Parse the feed straight from the response bytes; orjson skips the
+# intermediate str that resp.json() builds and parses several times faster.
+if orjson is not None:
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj: Any) -> str:
+        # aiohttp's json_serialize must return str
+        return orjson.dumps(obj).decode()
+else:
+    _json_loads = json.loads
+    _json_dumps = json.dumps
+
+
+def _parse_update_timestamp(update_str: str) -> Optional[float]:
+    """Return the epoch seconds of a VATSIM `general.update_timestamp`/`update`.
+
+    Accepts ISO 8601 ("2025-11-20T21:19:31.123Z") or the compact UTC form
+    ("20251120211931"). Returns None for an empty or unparseable value.
+    """
+    if len(update_str) == 14 and update_str.isdigit():
+        # Compact form: build the UTC epoch directly instead of via strptime
+        return float(timegm((
+            int(update_str[0:4]), int(update_str[4:6]), int(update_str[6:8]),
+            int(update_str[8:10]), int(update_str[10:12]), int(update_str[12:14]), 0, 0, 0,
+        )))
+    if not update_str:
+        return None
+    try:
+        return datetime.fromisoformat(update_str.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+async def _read_body(resp: aiohttp.ClientResponse) -> "bytes | bytearray":
+    """Read a response body, filling one preallocated buffer when possible.
+
+    With a known Content-Length and no content coding the chunks are copied
+    straight into a single bytearray instead of being collected and joined.
+    """
+    size = resp.content_length
+    if not size or resp.headers.get("Content-Encoding", "identity") != "identity":
+        return await resp.read()
+    buf = bytearray(size)
+    view = memoryview(buf)
+    off = 0
+    try:
+        async for chunk in resp.content.iter_any():
+            end = off + len(chunk)
+            if end > size:
+                raise aiohttp.ClientPayloadError("response body longer than Content-Length")
+            view[off:end] = chunk
+            off = end
+    finally:
+        view.release()
+    if off != size:
+        del buf[off:]
+    return buf
+
 
 class VatsimClient:
     """Asynchronous VATSIM client and poller.
@@ -36,23 +120,51 @@ class VatsimClient:
         # endpoints in the future.
         self.base_url = url
         self.interval = interval
-        self.latest: Optional[Dict[str, Any]] = None
-        self.latest_ts: Optional[float] = None
-        self.latest_delay: Optional[float] = None  # VATSIM data age/staleness
-        self._callbacks: List[Callable[[Dict[str, Any], float], None]] = []
+        # (payload, fetch timestamp, VATSIM data age). The poll loop is the
+        # only writer and replaces the whole tuple, so readers always see a
+        # consistent triple without locking.
+        self._snapshot: Tuple[Optional[Dict[str, Any]], Optional[float], Optional[float]] = (None, None, None)
+        # Set once the first payload has been published
+        self._has_data = asyncio.Event()
+        self._callbacks: List[Callable[[Dict[str, Any], List[Dict[str, Any]], float, "bytes | bytearray"], None]] = []
         self._task: Optional[asyncio.Task] = None
         self._session: Optional[aiohttp.ClientSession] = None
-        self._lock = asyncio.Lock()
+        # Digest of the last payload handed to callbacks; identical feeds are skipped
+        self._last_digest: Optional[bytes] = None
 
         # Adaptive timing: sync with VATSIM update cycle
         self._vatsim_update_ts: Optional[float] = None  # Last known VATSIM update timestamp
         self._sync_offset: float = 1.0  # Target offset after VATSIM update (1 second to allow propagation)
         self._resync_counter: int = 0  # Counter to trigger periodic resync
+        self._fail_count: int = 0  # Consecutive failed fetches, drives backoff
+
+    @property
+    def latest(self) -> Optional[Dict[str, Any]]:
+        return self._snapshot[0]
+
+    @property
+    def latest_ts(self) -> Optional[float]:
+        return self._snapshot[1]
 
-    def register_callback(self, cb: Callable[[Dict[str, Any], float], None]) -> None:
+    @property
+    def latest_delay(self) -> Optional[float]:
+        """VATSIM data age/staleness at the last fetch."""
+        return self._snapshot[2]
+
+    def snapshot(self) -> Tuple[Optional[Dict[str, Any]], Optional[float], Optional[float]]:
+        """Return (latest payload, fetch timestamp, VATSIM data age) from the same fetch."""
+        return self._snapshot
+
+    def register_callback(self, cb: Callable[[Dict[str, Any], List[Dict[str, Any]], float, "bytes | bytearray"], None]) -> None:
         """Register a synchronous callback that will be run after each successful fetch.
 
-        Callbacks are executed synchronously in the fetch loop. Keep them fast.
+        Callbacks are called as `cb(data, pilots, ts, raw)`, where `pilots` is
+        the feed's pilot list (resolved once per fetch), `ts` the fetch time
+        and `raw` the JSON body `data` was parsed from (so it can be stored
+        without serializing `data` again).
+
+        Callbacks run in order on a worker thread (so blocking DB writes don't
+        stall the event loop); the fetch loop waits for them to finish.
         """
         self._callbacks.append(cb)
 
@@ -70,20 +182,40 @@ class VatsimClient:
         except Exception:
             pass
 
+        self._ensure_session()
+        self._task = asyncio.create_task(self._poll_loop())
+
+    def _ensure_session(self) -> aiohttp.ClientSession:
+        """Return the shared session, creating it on first use.
+
+        Every fetch goes through this one session so the TLS connection to
+        VATSIM is kept alive between polls, and responses are compressed
+        (brotli when available, else gzip) and decoded by aiohttp.
+        """
+        if self._session is not None:
+            return self._session
         # create an SSL context that uses certifi's CA bundle when available
         try:
             if certifi:
                 ssl_ctx = ssl.create_default_context(cafile=certifi.where())
             else:
                 ssl_ctx = ssl.create_default_context()
-            # Force IPv4 to avoid IPv6 routing issues; increase timeout
-            connector = aiohttp.TCPConnector(ssl=ssl_ctx, family=2)  # AF_INET = IPv4
+            # Force IPv4 to avoid IPv6 routing issues; keep idle connections
+            # (and the DNS answer) around well past the poll interval so
+            # every poll reuses them
+            connector = aiohttp.TCPConnector(
+                ssl=ssl_ctx, family=socket.AF_INET, limit=10, limit_per_host=4,
+                keepalive_timeout=75, ttl_dns_cache=300,
+            )
         except Exception:
             connector = None
         # create session with connector (if connector is None, ClientSession will pick defaults)
         timeout = aiohttp.ClientTimeout(total=60, connect=30)
-        self._session = aiohttp.ClientSession(connector=connector, timeout=timeout)
-        self._task = asyncio.create_task(self._poll_loop())
+        self._session = aiohttp.ClientSession(
+            connector=connector, timeout=timeout, headers={"Accept-Encoding": _ACCEPT_ENCODING},
+            json_serialize=_json_dumps,
+        )
+        return self._session
 
     async def stop(self) -> None:
         if self._task:
@@ -97,61 +229,72 @@ class VatsimClient:
 
     async def _poll_loop(self) -> None:
         while True:
+            ok = False
             try:
                 await self._fetch_once()
+                ok = True
             except asyncio.TimeoutError:
                 logger.error("VATSIM fetch timeout after 60s connecting to %s", self.base_url)
             except aiohttp.ClientError as exc:
                 logger.error("VATSIM fetch client error: %s: %s", type(exc).__name__, exc)
+            except RuntimeError as exc:
+                # bad HTTP status from _fetch_once
+                logger.error("VATSIM fetch failed: %s", exc)
             except Exception as exc:
                 logger.exception("VATSIM fetch error: %s", exc)
 
             # Adaptive sleep: sync with VATSIM update cycle
             sleep_duration = self._calculate_adaptive_sleep()
+            if ok:
+                self._fail_count = 0
+            else:
+                # Back off exponentially while the feed keeps failing
+                sleep_duration = max(sleep_duration, self._backoff_delay())
+                self._fail_count += 1
             await asyncio.sleep(sleep_duration)
 
+    def _backoff_delay(self) -> float:
+        """Delay before the next attempt after `_fail_count` prior failures, capped at 4x the interval."""
+        return float(min(self.interval * (2 ** min(self._fail_count, 8)), self.interval * 4))
+
     async def _fetch_once(self) -> None:
-        if not self._session:
-            timeout = aiohttp.ClientTimeout(total=60, connect=30)
-            self._session = aiohttp.ClientSession(timeout=timeout)
+        session = self._ensure_session()
         # use base_url as the default fetch target
-        fetch_start = time.time()
-        async with self._session.get(self.base_url) as resp:
+        fetch_start = time.perf_counter()
+        async with session.get(self.base_url) as resp:
             if resp.status != 200:
                 raise RuntimeError(f"VATSIM fetch returned status {resp.status}")
-            data = await resp.json()
+            body = await _read_body(resp)
             ts = time.time()
-            fetch_duration = ts - fetch_start
+            fetch_duration = time.perf_counter() - fetch_start
+
+            # VATSIM often serves the same feed on consecutive polls; don't
+            # re-parse or re-store it
+            digest = hashlib.blake2b(body, digest_size=16).digest()
+            if digest == self._last_digest:
+                # Same data, so its age keeps growing from the stored update time
+                age = ts - self._vatsim_update_ts if self._vatsim_update_ts is not None else None
+                self._snapshot = (self._snapshot[0], ts, age)
+                self._record_delay(age)
+                logger.debug("VATSIM feed unchanged, fetch took %.2fs", fetch_duration)
+                return
+            data = _json_loads(body)
             
             # Extract VATSIM's update timestamp to measure staleness
-            vatsim_update_ts = None
-            vatsim_age_seconds = None
-            try:
-                general = data.get("general", {})
-                update_str = general.get("update_timestamp") or general.get("update")
-                if update_str:
-                    # Parse ISO or compact format
-                    from datetime import datetime
-                    if 'T' in update_str or '-' in update_str:
-                        vatsim_dt = datetime.fromisoformat(update_str.replace('Z', '+00:00'))
-                    else:
-                        # Compact: "20251120211931"
-                        y, m, d, h, mi, s = update_str[:4], update_str[4:6], update_str[6:8], update_str[8:10], update_str[10:12], update_str[12:14]
-                        vatsim_dt = datetime.strptime(f"{y}-{m}-{d}T{h}:{mi}:{s}Z", "%Y-%m-%dT%H:%M:%SZ")
-                    vatsim_update_ts = vatsim_dt.timestamp()
-                    vatsim_age_seconds = ts - vatsim_update_ts
-            except Exception:
-                pass
+            general = data.get("general") or {}
+            vatsim_update_ts = _parse_update_timestamp(
+                general.get("update_timestamp") or general.get("update") or ""
+            )
+            vatsim_age_seconds = ts - vatsim_update_ts if vatsim_update_ts is not None else None
             
-            # Count aircraft/pilots for log visibility
-            count = len((data.get("pilots") or data.get("aircraft") or []))
-            async with self._lock:
-                self.latest = data
-                self.latest_ts = ts
-                self.latest_delay = vatsim_age_seconds
-                # Track VATSIM update timestamp for adaptive timing
-                if vatsim_update_ts is not None:
-                    self._vatsim_update_ts = vatsim_update_ts
+            pilots = data.get("pilots") or data.get("aircraft") or []
+            count = len(pilots)
+            self._snapshot = (data, ts, vatsim_age_seconds)
+            self._has_data.set()
+            # Track VATSIM update timestamp for adaptive timing
+            if vatsim_update_ts is not None:
+                self._vatsim_update_ts = vatsim_update_ts
+            self._last_digest = digest
 
             # Log with staleness info
             if vatsim_age_seconds is not None:
@@ -161,25 +304,34 @@ class VatsimClient:
                 logger.info("VATSIM fetch success: %d aircraft at %.0f, fetch took %.2fs",
                            count, ts, fetch_duration)
 
-            # Record delay to metrics if available
-            if vatsim_age_seconds is not None:
-                try:
-                    from .metrics import METRICS
-                    METRICS.record_delay(vatsim_age_seconds, source="vatsim")
-                except Exception:
-                    pass  # Don't let metrics recording fail the fetch
-
-            # call registered callbacks (run them sync to keep ordering)
-            callback_start = time.time()
-            for cb in list(self._callbacks):
-                try:
-                    cb(data, ts)
-                except Exception as e:
-                    logger.exception("VATSIM callback error: %s", e)
-            callback_duration = time.time() - callback_start
+            self._record_delay(vatsim_age_seconds)
+
+            # call registered callbacks off the event loop, one after another
+            # to keep ordering
+            callback_start = time.perf_counter()
+            await asyncio.get_running_loop().run_in_executor(None, self._run_callbacks, data, pilots, ts, body)
+            callback_duration = time.perf_counter() - callback_start
             if callback_duration > 1.0:
                 logger.warning("VATSIM callbacks took %.2fs (slow!)", callback_duration)
 
+    @staticmethod
+    def _record_delay(age: Optional[float]) -> None:
+        """Record the VATSIM data age to metrics if available."""
+        if age is None or METRICS is None:
+            return
+        try:
+            METRICS.record_delay(age, source="vatsim")
+        except Exception:
+            pass  # Don't let metrics recording fail the fetch
+
+    def _run_callbacks(self, data: Dict[str, Any], pilots: List[Dict[str, Any]], ts: float,
+                       raw: "bytes | bytearray") -> None:
+        for cb in list(self._callbacks):
+            try:
+                cb(data, pilots, ts, raw)
+            except Exception as e:
+                logger.exception("VATSIM callback error: %s", e)
+
     def _calculate_adaptive_sleep(self) -> float:
         """Calculate adaptive sleep duration to sync with VATSIM update cycle.
 
@@ -216,15 +368,15 @@ class VatsimClient:
             offset_variation = (self._resync_counter % 5) * 0.5
             self._sync_offset = 0.5 + offset_variation
             self._resync_counter = 0
-            logger.info(f"Adaptive timing: adjusting sync offset to {self._sync_offset:.1f}s")
+            logger.info("Adaptive timing: adjusting sync offset to %.1fs", self._sync_offset)
 
         target_sleep = seconds_until_next_update + self._sync_offset
 
         # Clamp to reasonable bounds (don't sleep less than 5s or more than 20s)
         target_sleep = max(5.0, min(20.0, target_sleep))
 
-        logger.debug(f"Adaptive sleep: {target_sleep:.1f}s (cycle position: {seconds_into_cycle:.1f}s, "
-                    f"offset: {self._sync_offset:.1f}s)")
+        logger.debug("Adaptive sleep: %.1fs (cycle position: %.1fs, offset: %.1fs)",
+                     target_sleep, seconds_into_cycle, self._sync_offset)
 
         return target_sleep
 
@@ -234,12 +386,11 @@ class VatsimClient:
         This is useful to fetch other VATSIM endpoints without starting the
         poll loop. It does not update the client's `latest` cache.
         """
-        if not self._session:
-            self._session = aiohttp.ClientSession()
-        async with self._session.get(url, timeout=30) as resp:
+        session = self._ensure_session()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
             if resp.status != 200:
                 raise RuntimeError(f"fetch_url returned status {resp.status}")
-            data = await resp.json()
+            data = _json_loads(await resp.read())
             return data, time.time()
 
     async def fetch_resource(self, resource_path: str) -> Tuple[Optional[Dict[str, Any]], Optional[float]]:
@@ -265,18 +416,15 @@ class VatsimClient:
         If no payload is available and wait=True, wait up to `timeout` seconds
         for the first successful fetch.
         """
-        if self.latest is not None:
-            return self.latest, self.latest_ts
-        if not wait:
-            return None, None
-        waited = 0.0
-        interval = 0.5
-        while waited < timeout:
-            await asyncio.sleep(interval)
-            waited += interval
-            if self.latest is not None:
-                return self.latest, self.latest_ts
-        return None, None
+        if not self._has_data.is_set():
+            if not wait:
+                return None, None
+            try:
+                await asyncio.wait_for(self._has_data.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None, None
+        data, ts, _ = self._snapshot
+        return data, ts
 
 
 # Backwards-compatible alias for older imports
@@ -28,6 +28,9 @@ VIP_CALLSIGNS = {
     'EXEC2F': {'title': 'Executive Two Foxtrot', 'type': 'VP Family', 'service': 'Commercial'},
 }
 
+# Membership prefilter for the per-pilot scan in detect_vip_aircraft
+_VIP_KEYS = frozenset(VIP_CALLSIGNS)
+
 
 def is_vip_callsign(callsign: str) -> bool:
     """Check if a callsign matches any VIP pattern."""
@@ -56,12 +59,19 @@ def detect_vip_aircraft(aircraft_list: list) -> list:
         List of dicts with VIP aircraft info
     """
     vips = []
+    vip_keys = _VIP_KEYS
+    vip_lookup = VIP_CALLSIGNS.__getitem__
     
     for ac in aircraft_list:
-        callsign = ac.get('callsign', '').strip().upper()
+        callsign = ac.get('callsign')
+        if not callsign:
+            continue
+        # strip() returns the same object when there is nothing to trim, so
+        # it costs no allocation for normal callsigns
+        callsign = callsign.upper().strip()
         
-        if callsign in VIP_CALLSIGNS:
-            vip_info = VIP_CALLSIGNS[callsign]
+        if callsign in vip_keys:
+            vip_info = vip_lookup(callsign)
             
             # Build enriched VIP record
             vip_record = {
@@ -11,19 +11,28 @@ import yaml
 from .vatsim_client import VatsimClient
 from .storage import Storage
 
+try:
+    # libyaml-backed loader when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 logger = logging.getLogger("vncrcc.worker")
 
 
 async def main() -> None:
     cfg_path = os.environ.get("VNCRCC_CONFIG", "config/example_config.yaml")
-    cfg = yaml.safe_load(open(cfg_path)) if os.path.exists(cfg_path := cfg_path) else {}
+    cfg = {}
+    if os.path.exists(cfg_path):
+        with open(cfg_path, "r") as f:
+            cfg = yaml.load(f, Loader=_YamlLoader) or {}
     db_path = cfg.get("db_path", "vncrcc.db")
     storage = Storage(db_path)
     fetcher = VatsimClient(cfg.get("vatsim_url", "https://data.vatsim.net/v3/vatsim-data.json"), cfg.get("poll_interval", 15))
 
-    def cb(data, ts):
-        sid = storage.save_snapshot(data, ts)
-        count = len((data.get("pilots") or data.get("aircraft") or []))
+    def cb(data, pilots, ts, raw):
+        sid = storage.save_snapshot(data, ts, raw=raw)
+        count = len(pilots)
         logger.info("Saved snapshot %s with %d aircraft at %s", sid, count, ts)
 
     fetcher.register_callback(cb)
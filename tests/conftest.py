@@ -0,0 +1,15 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _geo_cache_dir(tmp_path_factory):
+    """Keep the parsed-geo disk cache out of the real home directory."""
+    old = os.environ.get("VNCRCC_GEO_CACHE_DIR")
+    os.environ["VNCRCC_GEO_CACHE_DIR"] = str(tmp_path_factory.mktemp("geo-cache"))
+    yield
+    if old is None:
+        os.environ.pop("VNCRCC_GEO_CACHE_DIR", None)
+    else:
+        os.environ["VNCRCC_GEO_CACHE_DIR"] = old
@@ -3,17 +3,16 @@ import httpx
 
 API = 'http://127.0.0.1:8000/api/v1'
 
-def measure_once():
-    with httpx.Client(timeout=10) as c:
-        t0 = time.time()
-        r1 = c.get(API + '/aircraft/latest')
-        t1 = time.time()
-        r2 = c.get(API + '/p56/')
-        t2 = time.time()
-        r3 = c.get(API + '/frz/')
-        t3 = time.time()
-        r4 = c.get(API + '/sfra/')
-        t4 = time.time()
+def measure_once(c: httpx.Client):
+    t0 = time.perf_counter()
+    r1 = c.get(API + '/aircraft/latest')
+    t1 = time.perf_counter()
+    r2 = c.get(API + '/p56/')
+    t2 = time.perf_counter()
+    r3 = c.get(API + '/frz/')
+    t3 = time.perf_counter()
+    r4 = c.get(API + '/sfra/')
+    t4 = time.perf_counter()
 
     print('aircraft/latest: status', r1.status_code, 'dt', round((t1-t0)*1000), 'ms')
     print('p56: status', r2.status_code, 'dt after aircraft', round((t2-t1)*1000), 'ms')
@@ -26,7 +25,9 @@ def measure_once():
         pass
 
 if __name__ == '__main__':
-    for i in range(5):
-        print('\nRun', i+1)
-        measure_once()
-        time.sleep(3)
+    # One client for all runs so the keep-alive connection is reused
+    with httpx.Client(timeout=10) as c:
+        for i in range(5):
+            print('\nRun', i+1)
+            measure_once(c)
+            time.sleep(3)
@@ -2,14 +2,17 @@ import os
 import tempfile
 import time
 import unittest
+import unittest.mock
 
 from fastapi.testclient import TestClient
 
 from vncrcc import app as vn_app
 from vncrcc import storage as storage_mod
-from vncrcc.geo.loader import find_geo_by_keyword
+from vncrcc.geo import loader as geo_loader
+from vncrcc.geo.loader import find_geo_by_keyword, match_shapes_xy
 from vncrcc.storage import Storage
-from shapely.geometry import Point
+import numpy as np
+import shapely
 
 
 def _interior_point(shp, samples: int = 20):
@@ -34,13 +37,15 @@ def _interior_point(shp, samples: int = 20):
     maxy -= pad_y
     if minx >= maxx or miny >= maxy:
         return shp.centroid
-    for i in range(samples):
-        for j in range(samples):
-            x = minx + (maxx - minx) * (i + 0.5) / samples
-            y = miny + (maxy - miny) * (j + 0.5) / samples
-            p = Point(x, y)
-            if shp.contains(p):
-                return p
+    # Test the whole grid cell-centre sample in one call instead of one
+    # Point/contains round-trip per cell
+    steps = (np.arange(samples) + 0.5) / samples
+    xs, ys = np.meshgrid(minx + (maxx - minx) * steps, miny + (maxy - miny) * steps, indexing="ij")
+    xs, ys = xs.ravel(), ys.ravel()
+    mask = shapely.contains_xy(shp, xs, ys)
+    idx = int(np.argmax(mask))
+    if mask[idx]:
+        return shapely.Point(xs[idx], ys[idx])
     c = shp.centroid
     if shp.contains(c):
         return c
@@ -68,35 +73,8 @@ class TestGeoEndpoints(unittest.TestCase):
         self.assertTrue(shapes and len(shapes) > 0, "SFRA geo not found in geo directory")
         shp, _ = shapes[0]
 
-        # Find a point that is strictly inside the shape (shp.contains returns True).
-        # representative_point() sometimes lies on the boundary for complex polygons,
-        # so sample a small grid inside the polygon bounds until an interior point is found.
-        def _interior_point(shp, samples=20):
-            minx, miny, maxx, maxy = shp.bounds
-            # shrink bounds slightly to avoid exact boundary points
-            pad_x = (maxx - minx) * 0.001 or 1e-6
-            pad_y = (maxy - miny) * 0.001 or 1e-6
-            minx += pad_x
-            miny += pad_y
-            maxx -= pad_x
-            maxy -= pad_y
-            if minx >= maxx or miny >= maxy:
-                # degenerate bounds, fallback to centroid
-                return shp.centroid
-            for i in range(samples):
-                for j in range(samples):
-                    x = minx + (maxx - minx) * (i + 0.5) / samples
-                    y = miny + (maxy - miny) * (j + 0.5) / samples
-                    p = Point(x, y)
-                    if shp.contains(p):
-                        return p
-            # last-resort: centroid or representative_point
-            c = shp.centroid
-            if shp.contains(c):
-                return c
-            r = shp.representative_point()
-            return r
-
+        # representative_point() can land on the boundary of complex polygons,
+        # so use the grid-sampled interior point helper.
         pt = _interior_point(shp)
         lat = pt.y
         lon = pt.x
@@ -140,5 +118,38 @@ class TestGeoEndpoints(unittest.TestCase):
         self.assertNotIn("HIGH2", calls)
 
 
+class TestMatchShapes(unittest.TestCase):
+    def test_line_tolerance_falls_back_on_bad_property(self):
+        line = shapely.LineString([(0.0, 0.0), (1.0, 0.0)])
+        lon = np.array([0.5, 0.5])
+        lat = np.array([0.0005, 0.5])
+        for props in ({}, {"tolerance": None}, {"tolerance": "abc"}):
+            matched = match_shapes_xy([(line, props)], lon, lat, line_tolerance=0.001)
+            self.assertEqual(matched.tolist(), [0, -1], props)
+        # a valid property still overrides the default
+        matched = match_shapes_xy([(line, {"tolerance": "0.0001"})], lon, lat, line_tolerance=0.001)
+        self.assertEqual(matched.tolist(), [-1, -1])
+
+
+class TestGeoDiskCache(unittest.TestCase):
+    def test_round_trip_without_pickle(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            src = os.path.join(tmp, "zone.geojson")
+            with open(src, "w") as f:
+                f.write('{"type": "FeatureCollection", "features": [{"type": "Feature", '
+                        '"properties": {"name": "Z"}, "geometry": {"type": "Polygon", '
+                        '"coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]]}}]}')
+            cache_dir = os.path.join(tmp, "cache")
+            with unittest.mock.patch.dict(os.environ, {"VNCRCC_GEO_CACHE_DIR": cache_dir, "VNCRCC_GEO_CACHE": "1"}):
+                first = geo_loader._load_geojson(geo_loader.Path(src))
+                [entry] = os.listdir(cache_dir)
+                self.assertTrue(entry.endswith(".wkb.json"))
+                with unittest.mock.patch.object(geo_loader, "_parse_geojson") as parse:
+                    second = geo_loader._load_geojson(geo_loader.Path(src))
+                parse.assert_not_called()
+        self.assertEqual(second[0][1], {"name": "Z"})
+        self.assertTrue(second[0][0].equals(first[0][0]))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -54,6 +54,7 @@ class TestP56Detection(unittest.TestCase):
     def _choose_crossing_pair(self, shp):
         # Sample points around centroid and return a pair whose line intersects shp
         from shapely.geometry import Point, LineString
+        from shapely.prepared import prep
         import math
 
         inside_pt = shp.representative_point()
@@ -67,14 +68,17 @@ class TestP56Detection(unittest.TestCase):
             rad = math.radians(deg)
             samples.append(Point(cx + math.cos(rad) * radius, cy + math.sin(rad) * radius))
 
+        # prepare once and test containment per sample, not per pair
+        pshp = prep(shp)
+        outside = [not pshp.contains(p) for p in samples]
         for i, p1 in enumerate(samples):
-            if shp.contains(p1):
+            if not outside[i]:
                 continue
             for j in range(i + 1, len(samples)):
-                p2 = samples[j]
-                if shp.contains(p2):
+                if not outside[j]:
                     continue
-                if shp.intersects(LineString([(p1.x, p1.y), (p2.x, p2.y)])):
+                p2 = samples[j]
+                if pshp.intersects(LineString([(p1.x, p1.y), (p2.x, p2.y)])):
                     return p1, p2, inside_pt
 
         # fallback: return two bbox-side points
@@ -1,7 +1,11 @@
+import json
 import os
+import sqlite3
 import tempfile
 import unittest
+from unittest import mock
 
+from vncrcc import storage as storage_mod
 from vncrcc.storage import Storage
 
 
@@ -25,6 +29,136 @@ class TestStorage(unittest.TestCase):
             except Exception:
                 pass
 
+    def test_legacy_text_snapshots_still_readable(self):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE snapshots (id INTEGER PRIMARY KEY, fetched_at REAL, raw_json TEXT)")
+            conn.execute("INSERT INTO snapshots (fetched_at, raw_json) VALUES (?, ?)", (1.0, json.dumps({"pilots": [{"cid": 1}]})))
+            conn.commit()
+            conn.close()
+            s = Storage(path)
+            s.save_snapshot({"pilots": [{"cid": 2}, {"cid": 3}]}, 2.0)
+            snaps = s.list_snapshots(limit=2)
+            self.assertEqual([len(x["data"]["pilots"]) for x in snaps], [2, 1])
+            s.close()
+        finally:
+            try:
+                os.remove(path)
+            except Exception:
+                pass
+
+    def test_latest_snapshot_ignores_older_save(self):
+        s = Storage(":memory:")
+        s.save_snapshot({"pilots": [{"cid": 1}]}, 20.0)
+        self.assertEqual(s.get_latest_snapshot()["fetched_at"], 20.0)
+        s.save_snapshot({"pilots": []}, 10.0)
+        self.assertEqual(s.get_latest_snapshot()["fetched_at"], 20.0)
+        s.save_snapshot({"pilots": []}, 30.0)
+        self.assertEqual(s.get_latest_snapshot()["fetched_at"], 30.0)
+        s.close()
+
+    @mock.patch.dict(os.environ, {"VNCRCC_TRACK_POSITIONS": "1"})
+    def test_position_history_arrays(self):
+        s = Storage(":memory:")
+        for ts in (1.0, 2.0, 3.0):
+            s.save_snapshot({"pilots": [{"cid": 7, "latitude": 38.0 + ts, "longitude": -77.0, "altitude": None}]}, ts)
+        arrs = s.get_aircraft_position_history_arrays(7, limit=2)
+        self.assertEqual(list(arrs["timestamp"]), [3.0, 2.0])
+        self.assertEqual(list(arrs["latitude"]), [41.0, 40.0])
+        self.assertTrue(all(a != a for a in arrs["altitude"]))
+        self.assertEqual(len(s.get_aircraft_position_history_arrays(8)["timestamp"]), 0)
+        s.close()
+
+    @mock.patch.dict(os.environ, {"VNCRCC_TRACK_POSITIONS": "1"})
+    def test_positions_for_cids(self):
+        s = Storage(":memory:")
+        for ts in (1.0, 2.0, 3.0):
+            s.save_snapshot({"pilots": [
+                {"cid": 7, "latitude": 38.0, "longitude": -77.0},
+                {"cid": 8, "latitude": 39.0, "longitude": -76.0},
+            ]}, ts)
+        hist = s.get_positions_for_cids([7, 8, 9], per_cid=2)
+        self.assertEqual(sorted(hist), [7, 8])
+        self.assertEqual([p["timestamp"] for p in hist[7]], [3.0, 2.0])
+        self.assertEqual(hist[8][0]["latitude"], 39.0)
+        s.close()
+
+    def test_in_memory_reads_share_writer(self):
+        s = Storage(":memory:")
+        s.save_snapshot({"pilots": []}, 1.0)
+        s.save_incident(2.0, "ABC123", 1, 38.9, -77.0, 1500.0, "p56", "{}")
+        self.assertEqual(s.get_latest_snapshot()["fetched_at"], 1.0)
+        self.assertEqual(len(s.list_incidents()), 1)
+        s.close()
+
+    def test_save_snapshot_stores_raw_body(self):
+        s = Storage(":memory:")
+        raw = b'{"pilots": [{"cid": 5, "callsign": "RAW1"}], "general": {"update": "20250101000000"}}'
+        s.save_snapshot(json.loads(raw), 1.0, raw=raw)
+        s.save_snapshot({"pilots": []}, 2.0)
+        snaps = s.list_snapshots(limit=2)
+        self.assertEqual(snaps[1]["data"], json.loads(raw))
+        self.assertEqual(snaps[0]["data"], {"pilots": []})
+        s.close()
+
+    def test_list_aircraft_returns_pilot_records(self):
+        s = Storage(":memory:")
+        pilot = {"cid": 5, "callsign": "REC1", "latitude": 38.9, "longitude": -77.0, "flight_plan": {"aircraft": "C172"}}
+        s.save_snapshot({"pilots": [pilot]}, 1.0)
+        [ac] = s.list_aircraft()
+        self.assertEqual(ac["callsign"], "REC1")
+        self.assertEqual(ac["flight_plan"], {"aircraft": "C172"})
+        s.close()
+
+    @unittest.skipIf(storage_mod.HAS_SQLALCHEMY, "sqlite fallback only")
+    def test_legacy_position_rows_migrated_to_batches(self):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            conn = sqlite3.connect(path)
+            conn.execute("CREATE TABLE aircraft_positions (id INTEGER PRIMARY KEY, cid INTEGER, callsign TEXT, timestamp REAL, "
+                         "latitude REAL, longitude REAL, altitude REAL, groundspeed REAL, heading REAL)")
+            conn.executemany("INSERT INTO aircraft_positions (cid, callsign, timestamp, latitude, longitude, altitude, groundspeed, heading) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             [(7, "OLD7", ts, 38.0 + ts, -77.0, 1000.0, 120.0, 90.0) for ts in (1.0, 2.0)])
+            conn.execute("PRAGMA user_version = 2")
+            conn.commit()
+            conn.close()
+            s = Storage(path)
+            hist = s.get_positions_for_cids([7], per_cid=5)
+            self.assertEqual([p["timestamp"] for p in hist[7]], [2.0, 1.0])
+            with s._read_conn() as c:
+                self.assertIsNone(c.execute("SELECT 1 FROM sqlite_master WHERE name = 'aircraft_positions'").fetchone())
+            s.close()
+        finally:
+            for suffix in ("", "-wal", "-shm"):
+                try:
+                    os.remove(path + suffix)
+                except Exception:
+                    pass
+
+    @unittest.skipIf(storage_mod.HAS_SQLALCHEMY, "sqlite fallback only")
+    @mock.patch.dict(os.environ, {"VNCRCC_TRACK_POSITIONS": "1"})
+    def test_position_walk_stops_at_limit_window(self):
+        s = Storage(":memory:")
+        s.save_snapshot({"pilots": [{"cid": 9, "latitude": 38.0, "longitude": -77.0}]}, 1.0)
+        for ts in (2.0, 3.0, 4.0):
+            s.save_snapshot({"pilots": [{"cid": 7, "latitude": 38.0, "longitude": -77.0}]}, ts)
+        self.assertEqual(s.get_positions_for_cids([9], per_cid=3), {})
+        self.assertEqual(len(s.get_positions_for_cids([9], per_cid=4)[9]), 1)
+        self.assertEqual(len(s.get_aircraft_positions("9", since=0.0)), 1)
+        s.close()
+
+    def test_delete_incidents(self):
+        s = Storage(":memory:")
+        ids = [s.save_incident(float(i), f"SIM{i}", i, 38.9, -77.0, 1500.0, "p56", "{}") for i in range(3)]
+        self.assertEqual(s.delete_incidents(ids[:2]), 2)
+        self.assertEqual(s.delete_incidents([]), 0)
+        self.assertEqual([i["id"] for i in s.list_incidents()], ids[2:])
+        s.close()
+
 
 if __name__ == "__main__":
     unittest.main()
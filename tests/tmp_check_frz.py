@@ -4,7 +4,8 @@ from vncrcc.storage import Storage
 from vncrcc import app as vn_app
 from fastapi.testclient import TestClient
 import time
-from shapely.geometry import Point
+import numpy as np
+import shapely
 
 shapes = find_geo_by_keyword('frz')
 print('shapes found', bool(shapes))
@@ -21,13 +22,14 @@ def interior(shp):
     if shp.contains(r):
         return r
     minx, miny, maxx, maxy = shp.bounds
-    for i in range(20):
-        for j in range(20):
-            x = minx + (maxx - minx) * (i + 0.5) / 20
-            y = miny + (maxy - miny) * (j + 0.5) / 20
-            p = Point(x, y)
-            if shp.contains(p):
-                return p
+    # test the whole 20x20 grid of cell centres in one call
+    steps = (np.arange(20) + 0.5) / 20
+    xs, ys = np.meshgrid(minx + (maxx - minx) * steps, miny + (maxy - miny) * steps, indexing="ij")
+    xs, ys = xs.ravel(), ys.ravel()
+    mask = shapely.contains_xy(shp, xs, ys)
+    idx = int(np.argmax(mask))
+    if mask[idx]:
+        return shapely.Point(xs[idx], ys[idx])
     return r
 
 pt = interior(shp)
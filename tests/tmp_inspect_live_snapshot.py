@@ -1,8 +1,9 @@
 import os
 import json
 from vncrcc import storage as storage_mod
-from vncrcc.geo.loader import find_geo_by_keyword, point_from_aircraft
-from shapely.geometry import Point
+from vncrcc.geo.loader import aircraft_columns, find_geo_by_keyword
+import numpy as np
+import shapely
 
 STORAGE = storage_mod.STORAGE
 if STORAGE is None:
@@ -25,50 +26,47 @@ if not shapes:
     print('FRZ shapes not found')
     raise SystemExit(1)
 
-# use first shape
+# use first shape; prepare it once so the per-aircraft contains/touches/
+# intersects checks below reuse GEOS's prepared index
 shp, props = shapes[0]
+shapely.prepare(shp)
 print('Using FRZ shape geom_type:', getattr(shp, 'geom_type', None))
 print('FRZ props:', props)
 
-def check_ac(a, tol=0.001):
-    pt = point_from_aircraft(a)
-    if not pt:
-        return {'ok': False, 'reason': 'no coords', 'pt': None}
-    lat = a.get('latitude') or a.get('lat') or a.get('y')
-    lon = a.get('longitude') or a.get('lon') or a.get('x')
-    alt = a.get('altitude') or a.get('alt')
-    try:
-        altv = float(alt) if alt is not None else None
-    except Exception:
-        altv = None
-    contains = False
-    touches = False
-    near = False
-    intersects = False
-    try:
-        contains = shp.contains(pt)
-        touches = shp.touches(pt)
-        d = pt.distance(shp)
-        near = d <= tol
-        intersects = shp.intersects(pt)
-    except Exception as e:
-        return {'ok': False, 'reason': f'geom error: {e}'}
-    return {
-        'ok': True,
-        'callsign': a.get('callsign') or a.get('call_sign') or a.get('cid'),
-        'lat': lat,
-        'lon': lon,
-        'alt': altv,
-        'contains': contains,
-        'touches': touches,
-        'near_tol': near,
-        'distance': d,
-        'intersects': intersects,
-    }
+def check_all(aircraft, tol=0.001):
+    """Evaluate every aircraft against the FRZ shape with vectorized predicates."""
+    cols = aircraft_columns(aircraft)
+    lats, lons, alts = cols['lat'], cols['lon'], cols['alt']
+    has_pt = ~np.isnan(lats)
+    pts = shapely.points(np.where(has_pt, lons, 0.0), np.where(has_pt, lats, 0.0))
+    contains = shapely.contains_xy(shp, lons, lats) & has_pt
+    touches = shapely.touches(shp, pts) & has_pt
+    intersects = shapely.intersects_xy(shp, lons, lats) & has_pt
+    dist = shapely.distance(shp, pts)
+    out = []
+    for i, a in enumerate(aircraft):
+        if not has_pt[i]:
+            out.append({'ok': False, 'reason': 'no coords', 'pt': None})
+            continue
+        out.append({
+            'ok': True,
+            'callsign': a.get('callsign') or a.get('call_sign') or a.get('cid'),
+            'lat': a.get('latitude') or a.get('lat') or a.get('y'),
+            'lon': a.get('longitude') or a.get('lon') or a.get('x'),
+            'alt': None if np.isnan(alts[i]) else float(alts[i]),
+            'contains': bool(contains[i]),
+            'touches': bool(touches[i]),
+            'near_tol': bool(dist[i] <= tol),
+            'distance': float(dist[i]),
+            'intersects': bool(intersects[i]),
+        })
+    return out
 
 matches = []
-for i, a in enumerate(aircraft[:200]):
-    res = check_ac(a)
+for i, res in enumerate(check_all(aircraft[:200])):
+    if not res['ok']:
+        print(i, res['reason'])
+        continue
     print(i, res['callsign'], 'lat', res['lat'], 'lon', res['lon'], 'alt', res.get('alt'), 'contains', res['contains'], 'touches', res['touches'], 'near', res['near_tol'], 'dist', round(res['distance'],6))
     if res['contains'] or res['touches'] or res['near_tol']:
         matches.append(res)
@@ -1,16 +1,23 @@
 #!/usr/bin/env python3
-"""Repair GeoJSON geometries under src/vncrcc/geo using Shapely.buffer(0).
+"""Repair GeoJSON geometries under src/vncrcc/geo using shapely.make_valid.
 
 Creates a .bak backup of each file changed and writes the repaired GeoJSON
 with pretty JSON formatting. Keeps properties and feature order intact.
 
 Usage: python tools/fix_geojson.py
 """
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import json
+import shapely
 from shapely.geometry import shape, mapping
 import logging
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 logging.basicConfig(level=logging.INFO, format="%(message)s")
 logger = logging.getLogger("fix_geojson")
 
@@ -20,6 +27,8 @@ GEO_DIR = ROOT / "src" / "vncrcc" / "geo"
 
 def _load_json(path: Path):
     try:
+        if orjson is not None:
+            return orjson.loads(path.read_bytes())
         return json.loads(path.read_text())
     except Exception as e:
         logger.error("Failed to read %s: %s", path, e)
@@ -28,7 +37,10 @@ def _load_json(path: Path):
 
 def _write_atomic(path: Path, data):
     tmp = path.with_suffix(path.suffix + ".tmp")
-    tmp.write_text(json.dumps(data, indent=2, sort_keys=False))
+    if orjson is not None:
+        tmp.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        tmp.write_text(json.dumps(data, indent=2, sort_keys=False))
     # backup original
     bak = path.with_suffix(path.suffix + ".bak")
     if not bak.exists():
@@ -47,7 +59,11 @@ def _repair_feature_geom(geom_obj):
 
     try:
         if not getattr(shp, "is_valid", True):
-            repaired = shp.buffer(0)
+            repaired = shapely.make_valid(shp)
+            if shp.geom_type in ("Polygon", "MultiPolygon") and repaired.geom_type == "GeometryCollection":
+                # make_valid can leave collapsed edges as lines; keep the area
+                polys = [g for g in shapely.get_parts(repaired) if g.geom_type in ("Polygon", "MultiPolygon")]
+                repaired = shapely.union_all(polys) if polys else repaired
             if getattr(repaired, "is_valid", False):
                 return mapping(repaired), True
             else:
@@ -104,14 +120,19 @@ def main():
 
     total = 0
     repaired_files = []
-    for f in files:
-        logger.info("Checking %s", f.name)
-        try:
-            if repair_file(f):
-                repaired_files.append(f.name)
-                total += 1
-        except Exception as e:
-            logger.error("Error repairing %s: %s", f.name, e)
+    # Files are independent; parse/repair/write them in worker processes
+    with ProcessPoolExecutor() as ex:
+        futures = []
+        for f in files:
+            logger.info("Checking %s", f.name)
+            futures.append((f, ex.submit(repair_file, f)))
+        for f, fut in futures:
+            try:
+                if fut.result():
+                    repaired_files.append(f.name)
+                    total += 1
+            except Exception as e:
+                logger.error("Error repairing %s: %s", f.name, e)
 
     logger.info("")
     logger.info("Repaired %d file(s)", total)
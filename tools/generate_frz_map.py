@@ -8,9 +8,15 @@ Usage:
 This script uses the project's package (vncrcc) so run it with PYTHONPATH set to src or from the project venv.
 """
 import json
+import re
 from pathlib import Path
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 OUT = Path("dc_restricted_areas_map.html")
 ROOT = Path(__file__).parent.parent
 
@@ -20,11 +26,17 @@ sys.path.insert(0, str(ROOT / "src"))
 
 from vncrcc.geo.loader import find_geo_by_keyword
 from vncrcc import storage as storage_mod
-from vncrcc.geo.loader import point_from_aircraft
+from vncrcc.geo.loader import aircraft_columns
 
+import numpy as np
+import shapely
 from shapely.geometry import mapping
 
 
+# Upper bounds (degrees) of the distance-to-FRZ colour classes used by the map
+_COLOR_BINS = [0.0, 0.001, 0.01]
+
+
 def load_data():
     # Load FRZ
     frz_shapes = find_geo_by_keyword("frz")
@@ -55,24 +67,36 @@ def load_data():
         raise SystemExit("No snapshot available in DB")
     aircraft = (snap.get("data") or {}).get("pilots") or (snap.get("data") or {}).get("aircraft") or []
 
-    pts = []
-    for a in aircraft:
-        pt = point_from_aircraft(a)
-        if not pt:
-            continue
-        # compute distance to FRZ geometry (for color coding)
-        dist = None
-        if frz_shapes:
-            try:
-                dist = pt.distance(frz_shapes[0][0])
-            except Exception:
-                pass
-        callsign = a.get("callsign") or a.get("call_sign") or a.get("cid")
-        pts.append({
+    cols = aircraft_columns(aircraft)
+    idx = np.flatnonzero(~np.isnan(cols["lat"]))
+    lons, lats = cols["lon"][idx], cols["lat"][idx]
+    # distance of every aircraft to the FRZ geometry in one call, bucketed into
+    # the map's colour classes: 0 inside/unknown, 1 <= 0.001 deg, 2 <= 0.01 deg, 3 far
+    dists = [None] * len(idx)
+    color_idx = [0] * len(idx)
+    if frz_shapes:
+        try:
+            d = shapely.distance(frz_shapes[0][0], shapely.points(lons, lats))
+            dists = d.tolist()
+            color_idx = np.digitize(d, _COLOR_BINS, right=True).astype(np.uint8).tolist()
+        except Exception:
+            pass
+
+    located = [aircraft[i] for i in idx]
+    pts = [
+        {
             "type": "Feature",
-            "properties": {"callsign": callsign, "alt": a.get("altitude") or a.get("alt"), "raw": a, "dist": dist},
-            "geometry": {"type": "Point", "coordinates": [pt.x, pt.y]},
-        })
+            "properties": {
+                "callsign": a.get("callsign") or a.get("call_sign") or a.get("cid"),
+                "alt": a.get("altitude") or a.get("alt"),
+                "raw": a,
+                "dist": dist,
+                "color_idx": ci,
+            },
+            "geometry": {"type": "Point", "coordinates": [x, y]},
+        }
+        for a, x, y, dist, ci in zip(located, lons.tolist(), lats.tolist(), dists, color_idx)
+    ]
 
     return frz_feature, sfra_feature, p56_features, pts, snap.get("fetched_at")
 
@@ -129,13 +153,11 @@ if (p56 && p56.features && p56.features.length > 0) {
 // Add layer control
 L.control.layers(null, overlays).addTo(map);
 
+// colour class computed server-side from distance to FRZ: inside -> red, near -> orange/yellow, far -> blue
+const COLORS = ['red', 'orange', 'yellow', 'blue'];
+
 function pointToLayer(feature, latlng) {
-    const dist = feature.properties.dist;
-    // classify: inside (dist==0 or undefined but intersects) -> red, near (<0.01) -> orange, far -> blue
-    let color = 'blue';
-    if (dist === 0 || dist === null) color = 'red';
-    else if (dist <= 0.001) color = 'orange';
-    else if (dist <= 0.01) color = 'yellow';
+    const color = COLORS[feature.properties.color_idx] || 'blue';
     const marker = L.circleMarker(latlng, { radius: 6, fillColor: color, color: '#000', weight:1, fillOpacity: 0.9 });
     return marker;
 }
@@ -158,17 +180,28 @@ L.geoJSON(aircraft, { pointToLayer: pointToLayer, onEachFeature: onEachFeature }
 """
 
 
+def _to_json(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj)
+
+
+_PLACEHOLDER = re.compile(r"__(FRZ|SFRA|P56|AC)__")
+
+
 def main():
     frz_feature, sfra_feature, p56_features, aircraft_pts, fetched_at = load_data()
     
     # Create GeoJSON FeatureCollections, handling None values
-    frz_json = json.dumps({"type": "FeatureCollection", "features": [frz_feature] if frz_feature else []})
-    sfra_json = json.dumps({"type": "FeatureCollection", "features": [sfra_feature] if sfra_feature else []})
-    p56_json = json.dumps({"type": "FeatureCollection", "features": p56_features})
-    aircraft_json = json.dumps({"type": "FeatureCollection", "features": aircraft_pts})
+    collections = {
+        "FRZ": _to_json({"type": "FeatureCollection", "features": [frz_feature] if frz_feature else []}),
+        "SFRA": _to_json({"type": "FeatureCollection", "features": [sfra_feature] if sfra_feature else []}),
+        "P56": _to_json({"type": "FeatureCollection", "features": p56_features}),
+        "AC": _to_json({"type": "FeatureCollection", "features": aircraft_pts}),
+    }
     
-    # substitute placeholders
-    html = HTML_TEMPLATE.replace('__FRZ__', frz_json).replace('__SFRA__', sfra_json).replace('__P56__', p56_json).replace('__AC__', aircraft_json)
+    # substitute all placeholders in one pass over the template
+    html = _PLACEHOLDER.sub(lambda m: collections[m.group(1)], HTML_TEMPLATE)
     OUT.write_text(html, encoding='utf-8')
     print('Wrote', OUT.resolve())
 
@@ -24,6 +24,11 @@ import json
 import time
 from copy import deepcopy
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 from vncrcc import storage
 from vncrcc.geo.loader import find_geo_by_keyword
 from vncrcc.api.v1 import p56 as p56_mod
@@ -53,17 +58,21 @@ def get_incident_ids():
 
 
 def delete_incidents(ids):
-    cur = storage.STORAGE.conn.cursor()
-    for _id in ids:
-        cur.execute("DELETE FROM incidents WHERE id = ?", (_id,))
-    storage.STORAGE.conn.commit()
+    # one statement for all ids, run through the storage's own writer
+    storage.STORAGE.delete_incidents(ids)
+
+
+def _pretty_json(obj) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS).decode()
+    return json.dumps(obj, indent=2, sort_keys=True, default=str)
 
 
 def write_history(obj):
     # overwrite history file atomically
     path = p56_history.HISTORY_PATH
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, indent=2, sort_keys=True, default=str))
+    path.write_text(_pretty_json(obj))
 
 
 def find_p56_shape():
@@ -77,11 +86,12 @@ def find_p56_shape():
 
 
 def choose_outside_and_inside_points(shp):
-    # Prefer to find two outside points such that the straight line between
-    # them intersects the shape. We'll sample points on a circle around the
-    # shape centroid and look for a pair whose LineString intersects `shp`.
-    from shapely.geometry import Point, LineString
-    import math
+    # Find two outside points such that the straight line between them
+    # intersects the shape. Sample points on a circle around an interior
+    # point and test all diameters (opposite sample pairs) in one call.
+    from shapely.geometry import Point
+    import numpy as np
+    import shapely
 
     inside_pt = shp.representative_point()
     cx, cy = inside_pt.x, inside_pt.y
@@ -91,28 +101,18 @@ def choose_outside_and_inside_points(shp):
     if radius <= 0:
         radius = 0.01
 
-    # sample points around the centroid
-    samples = []
-    for deg in range(0, 360, 10):
-        rad = math.radians(deg)
-        px = cx + math.cos(rad) * radius
-        py = cy + math.sin(rad) * radius
-        samples.append(Point(px, py))
-
-    # find any pair of sample points that are both outside and whose line intersects
-    for i, p1 in enumerate(samples):
-        if shp.contains(p1):
-            continue
-        for j in range(i + 1, len(samples)):
-            p2 = samples[j]
-            if shp.contains(p2):
-                continue
-            line = LineString([(p1.x, p1.y), (p2.x, p2.y)])
-            try:
-                if shp.intersects(line):
-                    return (p1, p2, inside_pt)
-            except Exception:
-                continue
+    # 36 samples every 10 degrees; sample i and i + 18 are opposite ends of a chord
+    rad = np.radians(np.arange(0, 360, 10))
+    px = cx + np.cos(rad) * radius
+    py = cy + np.sin(rad) * radius
+    half = len(rad) // 2
+    ends = np.stack([px, py], axis=-1)
+    chords = shapely.linestrings(np.stack([ends[:half], ends[half:]], axis=1))
+    outside = ~shapely.contains_xy(shp, px, py)
+    hits = shapely.intersects(shp, chords) & outside[:half] & outside[half:]
+    if hits.any():
+        k = int(np.argmax(hits))
+        return (Point(px[k], py[k]), Point(px[k + half], py[k + half]), inside_pt)
 
     # fallback: use bbox-west/east if no crossing pair found
     west = Point(minx - 0.01, cy)
@@ -205,13 +205,13 @@ def main():
     prev_ac, latest_ac = scenario_line_cross(shp, cid_base=900001)
     out_line = run_scenario(prev_ac, latest_ac)
     print("Line-cross result:")
-    print(json.dumps(out_line, indent=2, default=str))
+    print(_pretty_json(out_line))
 
     print("Running point-in scenario...")
     prev_ac2, latest_ac2 = scenario_point_in(shp, cid_base=910001)
     out_point = run_scenario(prev_ac2, latest_ac2)
     print("Point-in result:")
-    print(json.dumps(out_point, indent=2, default=str))
+    print(_pretty_json(out_point))
 
     # cleanup: remove any new incidents
     post_incidents = storage.STORAGE.list_incidents(limit=1000)
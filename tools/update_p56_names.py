@@ -3,54 +3,74 @@
 import json
 import sys
 from pathlib import Path
-from collections import defaultdict
 
-def analyze_and_update(history_path: str, dry_run: bool = True):
-    """Analyze name inconsistencies and optionally update them."""
-    with open(history_path, 'r') as f:
-        data = json.load(f)
-    
-    events = data.get('events', [])
-    current_inside = data.get('current_inside', {})
-    
-    # Build a map of CID -> most recent name from current_inside
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _dumps(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS)
+    return json.dumps(data, indent=2, sort_keys=True).encode()
+
+
+def _cid(event):
+    """Return the event's CID as a string, or None when it has none."""
+    cid = event.get('cid')
+    if cid is None or cid == '':
+        return None
+    return str(cid)
+
+
+def current_names_for(data) -> dict:
+    """Map CID -> name to normalise to.
+
+    Names of aircraft currently inside win; otherwise the latest name seen in
+    the last 50 events is used.
+    """
     current_names = {}
-    for cid, state in current_inside.items():
+    for cid, state in data.get('current_inside', {}).items():
         name = state.get('name')
         if name:
             current_names[cid] = name
-    
-    # Also get most recent names from recent events
-    for event in reversed(events[-50:]):  # Check last 50 events
-        cid = str(event.get('cid', ''))
-        name = event.get('name')
-        if cid and name and cid not in current_names:
-            current_names[cid] = name
-    
-    print(f"Found {len(events)} events")
-    print(f"Current names for {len(current_names)} CIDs")
-    
-    # Find inconsistencies
+    recent_names = {}
+    for event in data.get('events', [])[-50:]:
+        cid = _cid(event)
+        name = event.get('name', '')
+        if cid is not None and name:
+            recent_names[cid] = name
+    for cid, name in recent_names.items():
+        current_names.setdefault(cid, name)
+    return current_names
+
+
+def analyze(events, current_names) -> list:
+    """Print name statistics and return the updates that apply() would make."""
+    name_variations = {}
     updates_needed = []
-    name_variations = defaultdict(lambda: defaultdict(int))
-    
     for i, event in enumerate(events):
-        cid = str(event.get('cid', ''))
+        cid = _cid(event)
+        if cid is None:
+            continue
         event_name = event.get('name', '')
-        callsign = event.get('callsign', '')
-        
-        if cid:
-            name_variations[cid][event_name] += 1
-            
-            if cid in current_names and event_name != current_names[cid]:
-                updates_needed.append({
-                    'index': i,
-                    'cid': cid,
-                    'callsign': callsign,
-                    'old_name': event_name,
-                    'new_name': current_names[cid]
-                })
-    
+        bucket = name_variations.get(cid)
+        if bucket is None:
+            bucket = name_variations[cid] = {}
+        bucket[event_name] = bucket.get(event_name, 0) + 1
+        if cid in current_names and event_name != current_names[cid]:
+            updates_needed.append({
+                'index': i,
+                'cid': cid,
+                'callsign': event.get('callsign', ''),
+                'old_name': event_name,
+                'new_name': current_names[cid],
+            })
+
+    print(f"Found {len(events)} events")
+    print(f"Current names for {len(current_names)} CIDs")
+
     # Show CIDs with multiple name variations
     print("\nCIDs with name variations:")
     for cid, names in sorted(name_variations.items()):
@@ -59,9 +79,9 @@ def analyze_and_update(history_path: str, dry_run: bool = True):
             for name, count in sorted(names.items(), key=lambda x: -x[1]):
                 current_marker = " (CURRENT)" if name == current_names.get(cid) else ""
                 print(f"    {name!r} ({count}x){current_marker}")
-    
+
     print(f"\n{len(updates_needed)} events need name updates")
-    
+
     if updates_needed:
         print("\nUpdates to apply:")
         for u in updates_needed[:10]:  # Show first 10
@@ -69,28 +89,59 @@ def analyze_and_update(history_path: str, dry_run: bool = True):
             print(f"    {u['old_name']!r} -> {u['new_name']!r}")
         if len(updates_needed) > 10:
             print(f"  ... and {len(updates_needed) - 10} more")
-    
-    if not dry_run and updates_needed:
-        print(f"\nApplying {len(updates_needed)} updates...")
-        for u in updates_needed:
-            events[u['index']]['name'] = u['new_name']
-        
-        # Write backup
+    return updates_needed
+
+
+def apply(events, current_names) -> int:
+    """Rewrite mismatched event names in place; return how many changed."""
+    changed = 0
+    for event in events:
+        cid = _cid(event)
+        if cid is None:
+            continue
+        name = current_names.get(cid)
+        if name is not None and event.get('name', '') != name:
+            event['name'] = name
+            changed += 1
+    return changed
+
+
+def analyze_and_update(history_path: str, dry_run: bool = True, verbose: bool = False):
+    """Analyze name inconsistencies and optionally update them.
+
+    Statistics are only gathered for a dry run or when `verbose` is set.
+    """
+    raw = Path(history_path).read_bytes()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+    events = data.get('events', [])
+    current_names = current_names_for(data)
+
+    if dry_run or verbose:
+        count = len(analyze(events, current_names))
+        if dry_run:
+            if count:
+                print("\nDry run - no changes made. Run with --apply to update.")
+            else:
+                print("\nNo updates needed - all names are consistent!")
+            return count
+
+    count = apply(events, current_names)
+    if count:
+        print(f"\nApplied {count} updates")
+
+        # Write backup of the file as it was read, before the updates
         backup_path = Path(history_path).with_suffix('.json.bak')
-        with open(backup_path, 'w') as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        backup_path.write_bytes(raw)
         print(f"Backup written to {backup_path}")
-        
+
         # Write updated file
-        with open(history_path, 'w') as f:
-            json.dump(data, f, indent=2, sort_keys=True)
+        Path(history_path).write_bytes(_dumps(data))
         print(f"Updated {history_path}")
-    elif updates_needed:
-        print("\nDry run - no changes made. Run with --apply to update.")
     else:
         print("\nNo updates needed - all names are consistent!")
-    
-    return len(updates_needed)
+
+    return count
 
 if __name__ == '__main__':
     import argparse
@@ -99,7 +150,9 @@ if __name__ == '__main__':
                         help='Path to p56_history.json')
     parser.add_argument('--apply', action='store_true',
                         help='Actually apply updates (default is dry-run)')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Print name statistics when applying')
     args = parser.parse_args()
     
-    count = analyze_and_update(args.history, dry_run=not args.apply)
+    count = analyze_and_update(args.history, dry_run=not args.apply, verbose=args.verbose)
     sys.exit(0 if count == 0 else 1)